@@ -5,12 +5,13 @@ Run this locally (not in Docker) to create a token.json file.
 """
 
 import os
-import json
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from dotenv import load_dotenv
 
+from src.utils.json_utils import load_json
+
 load_dotenv()
 
 # Credentials file path
@@ -21,21 +22,31 @@ def generate_token():
     """Generate a token.json file from OAuth credentials."""
     print(f"Using credentials file: {CREDENTIALS_FILE}")
     
-    # Check if credentials file exists
-    if not os.path.exists(CREDENTIALS_FILE):
-        print(f"Error: Credentials file {CREDENTIALS_FILE} not found!")
-        return False
-        
     # Define the scopes
     SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
     
+    # Reuse an existing token if possible; refreshing is a single HTTPS call
+    try:
+        credentials = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
+        if credentials.expired and credentials.refresh_token:
+            credentials.refresh(Request())
+            with open(TOKEN_FILE, 'w') as token:
+                token.write(credentials.to_json())
+            print(f"Success! Existing token refreshed and saved to {TOKEN_FILE}")
+            return True
+        if credentials.valid:
+            print(f"Existing token at {TOKEN_FILE} is still valid")
+            return True
+    except Exception as e:
+        # Missing or unusable token, fall back to the full OAuth flow
+        print(f"No reusable token found ({e}), starting OAuth flow...")
+    
     try:
         # Create OAuth flow
         flow = InstalledAppFlow.from_client_secrets_file(CREDENTIALS_FILE, SCOPES)
         
         # Get the credentials file data to read the configured redirect URIs
-        with open(CREDENTIALS_FILE, 'r') as f:
-            creds_data = json.load(f)
+        creds_data = load_json(CREDENTIALS_FILE)
         
         # Run the OAuth flow - handle both desktop and web application credentials
         if 'web' in creds_data:
@@ -56,6 +67,9 @@ def generate_token():
         print(f"Success! Token saved to {TOKEN_FILE}")
         return True
         
+    except FileNotFoundError:
+        print(f"Error: Credentials file {CREDENTIALS_FILE} not found!")
+        return False
     except Exception as e:
         print(f"Error generating token: {e}")
         return False
@@ -5,12 +5,15 @@ This uses a Desktop client credentials file to simplify the process.
 """
 
 import os
-import json
+import shutil
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from pathlib import Path
 
+from src.utils.file_utils import find_latest_client_secret
+from src.utils.json_utils import load_json, dump_json
+
 # Configuration
 CONFIG_DIR = Path("config")
 CREDENTIALS_FILE = CONFIG_DIR / "credentials.json"
@@ -19,13 +22,12 @@ SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
 
 def convert_to_desktop_client():
     """Convert a web client to a desktop client if needed."""
-    if not CREDENTIALS_FILE.exists():
+    # Read the credentials file
+    try:
+        creds_data = load_json(CREDENTIALS_FILE)
+    except FileNotFoundError:
         print(f"Error: Credentials file not found at {CREDENTIALS_FILE}")
         return False
-        
-    # Read the credentials file
-    with open(CREDENTIALS_FILE, 'r') as f:
-        creds_data = json.load(f)
     
     # Check if it's already a desktop client
     if 'installed' in creds_data:
@@ -50,13 +52,11 @@ def convert_to_desktop_client():
         
         # Backup original file
         backup_file = CREDENTIALS_FILE.with_suffix('.json.bak')
-        with open(backup_file, 'w') as f:
-            json.dump(creds_data, f, indent=4)
+        dump_json(backup_file, creds_data)
         print(f"Original credentials backed up to {backup_file}")
         
         # Write the new desktop client format
-        with open(CREDENTIALS_FILE, 'w') as f:
-            json.dump(desktop_data, f, indent=4)
+        dump_json(CREDENTIALS_FILE, desktop_data)
         print("Converted to desktop client format successfully.")
         return True
     
@@ -65,6 +65,22 @@ def convert_to_desktop_client():
 
 def create_token():
     """Create a token using the credentials file."""
+    # Reuse an existing token if possible; refreshing is a single HTTPS call
+    try:
+        credentials = Credentials.from_authorized_user_file(str(TOKEN_FILE), SCOPES)
+        if credentials.expired and credentials.refresh_token:
+            credentials.refresh(Request())
+            with open(TOKEN_FILE, 'w') as token:
+                token.write(credentials.to_json())
+            print(f"\nSuccess! Existing token refreshed and saved to {TOKEN_FILE}")
+            return True
+        if credentials.valid:
+            print(f"\nExisting token at {TOKEN_FILE} is still valid")
+            return True
+    except Exception:
+        # Missing or unusable token, fall back to the full OAuth flow
+        pass
+    
     try:
         # Create OAuth flow
         flow = InstalledAppFlow.from_client_secrets_file(str(CREDENTIALS_FILE), SCOPES)
@@ -97,11 +113,11 @@ def main():
     if not CREDENTIALS_FILE.exists():
         # Look for credentials in Downloads folder
         downloads = Path.home() / "Downloads"
-        client_secrets = list(downloads.glob("client_secret_*.json"))
         
-        if client_secrets:
-            # Use the most recent client_secret file
-            latest = max(client_secrets, key=lambda p: p.stat().st_mtime)
+        # Use the most recent client_secret file
+        latest = find_latest_client_secret(downloads)
+        
+        if latest:
             print(f"Found credentials file: {latest}")
             print(f"Copying to {CREDENTIALS_FILE}")
             
@@ -109,9 +125,7 @@ def main():
             os.makedirs(CONFIG_DIR, exist_ok=True)
             
             # Copy the file
-            with open(latest, 'r') as src:
-                with open(CREDENTIALS_FILE, 'w') as dst:
-                    dst.write(src.read())
+            shutil.copyfile(latest, CREDENTIALS_FILE)
         else:
             print(f"Error: No credentials file found at {CREDENTIALS_FILE}")
             print("and no client_secret_*.json files found in Downloads folder.")
@@ -6,10 +6,33 @@ This script will handle setting up the environment and launching the bot.
 
 import os
 import sys
+import hashlib
 import subprocess
 from pathlib import Path
 import platform
 
+try:
+    from dotenv import dotenv_values
+except ImportError:  # This script can run before the venv with python-dotenv exists
+    dotenv_values = None
+
+def venv_matches_python(venv_path: Path, python_version: str) -> bool:
+    """Check if an existing virtual environment was created with this Python version."""
+    cfg_path = venv_path / "pyvenv.cfg"
+    if not cfg_path.exists():
+        return False
+    
+    with open(cfg_path, "r") as f:
+        for line in f:
+            key, _, value = line.partition("=")
+            if key.strip() in ("version", "version_info"):
+                return value.strip() == python_version
+    return False
+
+def requirements_hash(requirements_file: str) -> str:
+    """Hash the requirements file so unchanged dependencies can be detected."""
+    return hashlib.blake2b(Path(requirements_file).read_bytes()).hexdigest()
+
 def setup_environment():
     """Set up Python virtual environment if it doesn't exist."""
     venv_path = Path("venv")
@@ -27,15 +50,25 @@ def setup_environment():
             print("Setup aborted. Try using Python 3.11.")
             sys.exit(1)
     
-    # Remove existing virtual environment if it exists
-    if venv_path.exists():
+    # Only recreate the virtual environment when it was built with another Python
+    if venv_path.exists() and not venv_matches_python(venv_path, python_version):
         print("Recreating virtual environment...")
         import shutil
         shutil.rmtree(venv_path)
     
     # Create virtual environment
-    print("Creating virtual environment...")
-    subprocess.run([sys.executable, "-m", "venv", "venv"], check=True)
+    if not venv_path.exists():
+        print("Creating virtual environment...")
+        subprocess.run([sys.executable, "-m", "venv", "venv"], check=True)
+    
+    # Skip all pip work when the requirements haven't changed since the last install
+    requirements_file = "requirements-py313.txt" if python_version.startswith("3.13") else "requirements.txt"
+    hash_file = venv_path / ".req_hash"
+    req_hash = requirements_hash(requirements_file)
+    
+    if hash_file.exists() and hash_file.read_text().strip() == req_hash:
+        print("Requirements unchanged, reusing existing virtual environment.")
+        return
     
     # Determine the pip path based on platform
     if os.name == 'nt':  # Windows
@@ -45,8 +78,7 @@ def setup_environment():
     
     # Install essential packages first
     print("Installing essential packages...")
-    subprocess.run([str(pip_path), "install", "--upgrade", "pip"], check=True)
-    subprocess.run([str(pip_path), "install", "wheel"], check=True)
+    subprocess.run([str(pip_path), "install", "--upgrade", "pip", "wheel"], check=True)
     
     # Install a compatible version of pydantic
     print("Installing pydantic...")
@@ -54,19 +86,18 @@ def setup_environment():
     
     # Install specific packages that have issues with Python 3.13
     if python_version.startswith("3.13"):
+        # Install all pins in one pip run so the resolver only runs once
         print("Installing specific dependency versions for Python 3.13...")
-        subprocess.run([str(pip_path), "install", "python-telegram-bot==20.7"], check=True)
-        subprocess.run([str(pip_path), "install", "anthropic==0.8.0"], check=True)
-        subprocess.run([str(pip_path), "install", "google-auth==2.23.0"], check=True)
-        subprocess.run([str(pip_path), "install", "google-auth-oauthlib==1.1.0"], check=True)
-        subprocess.run([str(pip_path), "install", "google-auth-httplib2==0.1.1"], check=True)
-        subprocess.run([str(pip_path), "install", "google-api-python-client==2.100.0"], check=True)
-        subprocess.run([str(pip_path), "install", "python-dotenv==1.0.0"], check=True)
-        subprocess.run([str(pip_path), "install", "loguru==0.7.2"], check=True)
     else:
         # Install all requirements
         print("Installing requirements...")
-        subprocess.run([str(pip_path), "install", "-r", "requirements.txt"], check=True)
+    subprocess.run(
+        [str(pip_path), "install", "--upgrade-strategy", "only-if-needed", "-r", requirements_file],
+        check=True
+    )
+    
+    # Remember what was installed
+    hash_file.write_text(req_hash)
 
 def run_bot():
     """Run the Bramify bot."""
@@ -81,9 +112,9 @@ def run_bot():
     # Create logs directory if it doesn't exist
     os.makedirs("logs", exist_ok=True)
     
-    # Make sure .env file exists with the spreadsheet ID
-    if not Path(".env").exists():
-        with open(".env", "w") as f:
+    # Make sure .env file exists with the spreadsheet ID ("x" mode fails if it already exists)
+    try:
+        with open(".env", "x") as f:
             f.write("# Telegram\n")
             f.write(f"TELEGRAM_BOT_TOKEN={os.environ.get('TELEGRAM_BOT_TOKEN', '')}\n")
             f.write(f"TELEGRAM_ALLOWED_USER_IDS={os.environ.get('TELEGRAM_ALLOWED_USER_IDS', '')}\n\n")
@@ -92,11 +123,11 @@ def run_bot():
             f.write("# Google Sheets\n")
             f.write(f"GOOGLE_SHEETS_CREDENTIALS_FILE=config/service_account.json\n")
             f.write(f"GOOGLE_SHEETS_SPREADSHEET_ID={os.environ.get('GOOGLE_SHEETS_SPREADSHEET_ID', '')}\n")
+    except FileExistsError:
+        pass
     
-    # Run the bot
-    env = os.environ.copy()
-    env["PYTHONPATH"] = os.getcwd()
-    subprocess.run([str(python_path), "src/main.py"], env=env)
+    # Replace this process with the bot so no supervisor interpreter stays resident
+    os.execvpe(str(python_path), [str(python_path), "src/main.py"], {**os.environ, "PYTHONPATH": os.getcwd()})
 
 def main():
     """Main function to run Bramify locally."""
@@ -115,15 +146,19 @@ def main():
     env_file = Path(".env")
     spreadsheet_id = ""
     
-    if env_file.exists():
-        with open(env_file, "r") as f:
-            env_content = f.read()
-            
-        if "GOOGLE_SHEETS_SPREADSHEET_ID=" in env_content:
-            # Extract the spreadsheet ID from the .env file
-            for line in env_content.split("\n"):
-                if line.startswith("GOOGLE_SHEETS_SPREADSHEET_ID="):
-                    spreadsheet_id = line.split("=", 1)[1].strip()
+    # Extract the spreadsheet ID from the .env file
+    try:
+        if dotenv_values is not None:
+            with open(env_file, "r") as f:
+                spreadsheet_id = (dotenv_values(stream=f).get("GOOGLE_SHEETS_SPREADSHEET_ID") or "").strip()
+        else:
+            with open(env_file, "r") as f:
+                for line in f:
+                    if line.startswith("GOOGLE_SHEETS_SPREADSHEET_ID="):
+                        spreadsheet_id = line.split("=", 1)[1].strip()
+                        break
+    except FileNotFoundError:
+        pass
     
     if not spreadsheet_id:
         # Ask for the spreadsheet ID
@@ -13,14 +13,21 @@ Instructions:
 
 import os
 import json
+import shutil
 from pathlib import Path
 import sys
 
+from src.utils.file_utils import find_latest_file
+from src.utils.json_utils import load_json, dumps_json
+
 # Configuration
 CONFIG_DIR = Path("config")
 SERVICE_ACCOUNT_FILE = CONFIG_DIR / "service_account.json"
 TOKEN_FILE = CONFIG_DIR / "token.json"
 
+# The reference token only ever varies in the key file path
+TOKEN_TEMPLATE = b'{\n  "type": "service_account_reference",\n  "service_account_file": %b\n}'
+
 def main():
     """Main function to set up service account credentials."""
     print("=== Bramify Service Account Setup ===\n")
@@ -32,34 +39,32 @@ def main():
     if not SERVICE_ACCOUNT_FILE.exists():
         # Look for service account in Downloads folder
         downloads = Path.home() / "Downloads"
-        service_account_files = list(downloads.glob("*-*.json"))
         
-        if service_account_files:
-            # Use the most recent service account file
-            latest = max(service_account_files, key=lambda p: p.stat().st_mtime)
+        # Use the most recent service account file
+        latest = find_latest_file(downloads, "*-*.json")
+        
+        if latest:
             print(f"Found potential service account file: {latest}")
             
             # Check if it looks like a service account file
-            with open(latest, 'r') as f:
-                try:
-                    data = json.load(f)
-                    if 'type' in data and data['type'] == 'service_account':
-                        print(f"Confirmed service account file. Copying to {SERVICE_ACCOUNT_FILE}")
+            try:
+                data = load_json(latest)
+                if 'type' in data and data['type'] == 'service_account':
+                    print(f"Confirmed service account file. Copying to {SERVICE_ACCOUNT_FILE}")
+                    
+                    # Copy the file
+                    shutil.copyfile(latest, SERVICE_ACCOUNT_FILE)
                         
-                        # Copy the file
-                        with open(SERVICE_ACCOUNT_FILE, 'w') as dst:
-                            json.dump(data, f, indent=2)
-                            
-                        print(f"\nIMPORTANT: Share your Google Sheet with this email address:")
-                        print(f"  {data.get('client_email', 'EMAIL NOT FOUND')}")
-                        print("\nDon't skip this step or the service account won't have access!")
-                    else:
-                        print(f"The file doesn't appear to be a service account key file.")
-                        print("Please download a service account key file from Google Cloud Console.")
-                        return False
-                except json.JSONDecodeError:
-                    print(f"The file is not valid JSON. Please download a service account key file.")
+                    print(f"\nIMPORTANT: Share your Google Sheet with this email address:")
+                    print(f"  {data.get('client_email', 'EMAIL NOT FOUND')}")
+                    print("\nDon't skip this step or the service account won't have access!")
+                else:
+                    print(f"The file doesn't appear to be a service account key file.")
+                    print("Please download a service account key file from Google Cloud Console.")
                     return False
+            except json.JSONDecodeError:
+                print(f"The file is not valid JSON. Please download a service account key file.")
+                return False
         else:
             print("\nNo service account file found.")
             print("\nPlease follow these steps:")
@@ -73,29 +78,22 @@ def main():
     else:
         # Verify the service account file
         try:
-            with open(SERVICE_ACCOUNT_FILE, 'r') as f:
-                data = json.load(f)
-                if 'type' in data and data['type'] == 'service_account':
-                    print(f"Service account file found at {SERVICE_ACCOUNT_FILE}")
-                    print(f"\nIMPORTANT: Make sure your Google Sheet is shared with:")
-                    print(f"  {data.get('client_email', 'EMAIL NOT FOUND')}")
-                else:
-                    print(f"The file at {SERVICE_ACCOUNT_FILE} doesn't appear to be a valid service account key.")
-                    print("Please download a proper service account key file.")
-                    return False
+            data = load_json(SERVICE_ACCOUNT_FILE)
+            if 'type' in data and data['type'] == 'service_account':
+                print(f"Service account file found at {SERVICE_ACCOUNT_FILE}")
+                print(f"\nIMPORTANT: Make sure your Google Sheet is shared with:")
+                print(f"  {data.get('client_email', 'EMAIL NOT FOUND')}")
+            else:
+                print(f"The file at {SERVICE_ACCOUNT_FILE} doesn't appear to be a valid service account key.")
+                print("Please download a proper service account key file.")
+                return False
         except (json.JSONDecodeError, IOError):
             print(f"Error reading {SERVICE_ACCOUNT_FILE}.")
             print("Please download a proper service account key file.")
             return False
     
     # Create a dummy token file that indicates we're using a service account
-    token_data = {
-        "type": "service_account_reference",
-        "service_account_file": str(SERVICE_ACCOUNT_FILE)
-    }
-    
-    with open(TOKEN_FILE, 'w') as f:
-        json.dump(token_data, f, indent=2)
+    TOKEN_FILE.write_bytes(TOKEN_TEMPLATE % dumps_json(str(SERVICE_ACCOUNT_FILE)))
     
     print(f"\nCreated service account reference at {TOKEN_FILE}")
     print("\nSetup completed successfully!")
@@ -1,7 +1,13 @@
 """Core bot functionality for Bramify."""
 
 import os
-from typing import List, Dict, Any, Optional
+import re
+import time
+import weakref
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from loguru import logger
 
 from telegram import Update, ReplyKeyboardMarkup, ReplyKeyboardRemove
@@ -9,38 +15,150 @@ from telegram.ext import Application, CommandHandler, MessageHandler, filters, C
 
 from core.config import load_config, AppConfig
 from core.plugin_manager import PluginManager
-from integrations.claude.client import ClaudeClient
-from integrations.google_sheets.client import GoogleSheetsClient
-from integrations.client_mapper import ClientMapper
+from integrations.claude.client import get_claude_client
+from integrations.google_sheets.client import get_sheets_client
+from integrations.client_mapper import get_client_mapper
 from integrations.telegram.utils import send_typing_action
 
+BASE_HELP_TEXT = (
+    "🤖 *Bramify Help* 🤖\n\n"
+    "*Commando's:*\n"
+    "/start - Start een gesprek met de bot\n"
+    "/help - Toon dit help-bericht\n"
+    "/test_mode of /testmode - Schrijf uren alleen naar het testblad\n"
+    "/enable_production of /enableproduction - Schrijf uren naar het echte blad\n"
+    "/list_clients - Bekijk alle bekende klantcodes\n\n"
+    
+    "*Urenregistratie:*\n"
+    "Vertel me gewoon waar je aan gewerkt hebt, en ik registreer je uren. "
+    "Bijvoorbeeld: 'Vandaag heb ik 4 uur gewerkt aan Project X voor Klant Y.'\n\n"
+    
+    "*Huidige modus:* {mode}\n\n"
+)
+
+MODE_DESCRIPTIONS = {
+    True: "Test modus (gegevens gaan naar testblad)",
+    False: "Productie modus (gegevens gaan naar het echte blad)",
+}
+
+# Client codes entered by the user must be exactly three letters
+CLIENT_CODE_RE = re.compile(r"^[A-Za-z]{3}$")
+
+# Plain text messages, shared by the client code prompt and the general message handler
+TEXT_NO_COMMAND = filters.TEXT & ~filters.COMMAND
+
+# WorkEntry fields kept for the spreadsheet row and the confirmation reply
+WORK_ENTRY_FIELDS = frozenset(
+    ("date", "client", "project", "hours", "billable", "description", "description_preview")
+)
+
+# Work entry confirmation templates, filled with format_map
+WORK_ENTRY_DETAILS_TEMPLATE = (
+    "📅 Datum: {date}\n"
+    "👥 Klant: {client} ({client_code})\n"
+    "⏱️ Uren: {hours}\n"
+    "💰 Declarabel: {billable_nl}\n"
+    "📝 Beschrijving: {description_preview}...\n"
+)
+WORK_ENTRY_SAVED_TEMPLATE = "✅ Ik heb je werk geregistreerd:\n\n" + WORK_ENTRY_DETAILS_TEMPLATE
+CLIENT_CODE_SAVED_TEMPLATE = (
+    "✅ Urenregistratie opgeslagen met klantcode: {client_code}\n\n" + WORK_ENTRY_DETAILS_TEMPLATE
+)
+WORK_ENTRY_FAILED_TEXT = "❌ Kon de urenregistratie niet opslaan. Probeer het opnieuw."
+
+# Help text per mode (keyed by test_mode), formatted once at import time
+BASE_HELP_TEXTS = {
+    test_mode: BASE_HELP_TEXT.format(mode=description)
+    for test_mode, description in MODE_DESCRIPTIONS.items()
+}
+
 class BramifyBot:
     """Main bot class handling Telegram interactions."""
     
     # Define conversation states
     WAITING_FOR_CLIENT_CODE = 1
     
+    # context.user_data key for a work entry waiting for a client code
+    PENDING_WORK_ENTRY = "pending_work_entry"
+    
+    # Seconds before an unanswered client code question is abandoned
+    PENDING_ENTRY_TTL = 600
+    
+    # Queued Sheets writes are flushed after this many seconds or this many rows
+    WRITE_BATCH_WINDOW = 0.5
+    WRITE_BATCH_SIZE = 50
+    
+    # Seconds shutdown waits for the remaining queued writes
+    SHUTDOWN_WRITE_TIMEOUT = 30
+    
+    # Unauthorized users get at most one rejection reply per window
+    REJECT_REPLY_WINDOW = 60
+    REJECT_CACHE_SIZE = 1024
+    
+    # Maximum number of updates handled at the same time
+    CONCURRENT_UPDATES = 32
+    
+    # Worker threads for blocking Google Sheets and Claude calls
+    EXECUTOR_WORKERS = 16
+    
+    # Seconds a getUpdates request is held open by Telegram while idle
+    POLL_TIMEOUT = 50
+    
+    # Only messages are handled (commands, text and plugin commands); Telegram
+    # doesn't send other update types, so they never cost a request or a handler pass
+    ALLOWED_UPDATES = [Update.MESSAGE]
+    
     def __init__(self):
         """Initialize the Bramify bot with required integrations."""
-        # Load configuration
-        self.config = load_config()
+        # Load configuration; only the bot settings are kept, the integrations read their own
+        config = load_config()
+        self._bot_config = config.bot
+        self._token = config.bot.telegram_token
         
-        if not self.config.bot.telegram_token:
+        if not self._token:
             raise ValueError("TELEGRAM_BOT_TOKEN not set in environment variables")
         
-        # Initialize integrations
-        self.claude = ClaudeClient()
-        self.sheets = GoogleSheetsClient()
-        self.client_mapper = ClientMapper()
+        # Allowed users are checked on every update, so keep a direct reference
+        self._allowed_ids = config.bot.allowed_user_ids
+        if not self._allowed_ids:
+            # If no allowed users are specified, allow everyone (not recommended for production)
+            logger.warning("No allowed users specified, allowing all users")
+        
+        # Initialize integrations (process-wide, so a restarted bot reuses their connections)
+        self.claude = get_claude_client()
+        self.sheets = get_sheets_client()
+        self.client_mapper = get_client_mapper()
+        
+        # Chat ID -> lock serializing that chat's messages; unused locks are dropped automatically
+        self._chat_locks = weakref.WeakValueDictionary()
+        
+        # Full /help texts per mode and the plugin help they were built from
+        self._help_texts = {}
+        self._help_plugin_text = None
         
-        # Conversation state tracking
-        self.pending_work_entries = {}  # User ID -> pending work entry
+        # Rendered /list_clients text and the mapper version it was built from
+        self._client_list_cache = (None, "")
+        
+        # Work entries waiting to be written to Google Sheets in a batch
+        self._work_entry_queue = asyncio.Queue()
+        self._write_task = None
+        self._accepting_work_entries = True
+        
+        # User ID -> monotonic time of the last rejection reply
+        self._reject_lru = OrderedDict()
         
         # Initialize Telegram application
-        self.app = Application.builder().token(self.config.bot.telegram_token).build()
+        # Updates are processed concurrently so Claude and Sheets waits overlap
+        self.app = (
+            Application.builder()
+            .token(self._token)
+            .concurrent_updates(self.CONCURRENT_UPDATES)
+            .post_shutdown(self._on_shutdown)
+            .build()
+        )
         
         # Initialize plugin manager
-        self.plugin_manager = PluginManager(self.app)
+        self.plugin_manager = PluginManager(self.app, self.sheets)
         
         # Register core handlers
         self._register_handlers()
@@ -52,10 +170,9 @@ class BramifyBot:
         # Command handlers
         self.app.add_handler(CommandHandler("start", self.cmd_start))
         self.app.add_handler(CommandHandler("help", self.cmd_help))
-        self.app.add_handler(CommandHandler("enable_production", self.cmd_enable_production))
-        self.app.add_handler(CommandHandler("enableproduction", self.cmd_enable_production))  # Add alias without underscore
-        self.app.add_handler(CommandHandler("test_mode", self.cmd_test_mode))
-        self.app.add_handler(CommandHandler("testmode", self.cmd_test_mode))  # Add alias without underscore
+        # Aliases without underscore share a single handler
+        self.app.add_handler(CommandHandler(["enable_production", "enableproduction"], self.cmd_enable_production))
+        self.app.add_handler(CommandHandler(["test_mode", "testmode"], self.cmd_test_mode))
         self.app.add_handler(CommandHandler("list_clients", self.cmd_list_clients))
         
         # Conversation handler for client code
@@ -63,7 +180,7 @@ class BramifyBot:
             entry_points=[],  # This is handled by handle_message
             states={
                 self.WAITING_FOR_CLIENT_CODE: [
-                    MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_client_code)
+                    MessageHandler(TEXT_NO_COMMAND, self.handle_client_code)
                 ],
             },
             fallbacks=[CommandHandler("cancel", self.cancel_conversation)],
@@ -74,7 +191,7 @@ class BramifyBot:
         
         # Message handler for text messages (lowest priority)
         self.app.add_handler(MessageHandler(
-            filters.TEXT & ~filters.COMMAND, 
+            TEXT_NO_COMMAND, 
             self.handle_message,
             # Lower number = higher priority, this should be lower priority than plugins
             1
@@ -88,7 +205,7 @@ class BramifyBot:
     
     async def cmd_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command."""
-        if not self._is_user_allowed(update):
+        if not await self._is_user_allowed(update):
             return
         
         await update.message.reply_text(
@@ -99,76 +216,77 @@ class BramifyBot:
     
     async def cmd_help(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /help command."""
-        if not self._is_user_allowed(update):
+        if not await self._is_user_allowed(update):
             return
         
-        base_help_text = (
-            "🤖 *Bramify Help* 🤖\n\n"
-            "*Commando's:*\n"
-            "/start - Start een gesprek met de bot\n"
-            "/help - Toon dit help-bericht\n"
-            "/test_mode of /testmode - Schrijf uren alleen naar het testblad\n"
-            "/enable_production of /enableproduction - Schrijf uren naar het echte blad\n"
-            "/list_clients - Bekijk alle bekende klantcodes\n\n"
-            
-            "*Urenregistratie:*\n"
-            "Vertel me gewoon waar je aan gewerkt hebt, en ik registreer je uren. "
-            "Bijvoorbeeld: 'Vandaag heb ik 4 uur gewerkt aan Project X voor Klant Y.'\n\n"
-            
-            f"*Huidige modus:* {'Test modus (gegevens gaan naar testblad)' if self.test_mode else 'Productie modus (gegevens gaan naar het echte blad)'}\n\n"
-        )
-        
-        # Add plugin help text
+        # The plugin manager returns the same cached string until plugins change,
+        # so the full texts only need to be rebuilt when that string is replaced
         plugin_help = self.plugin_manager.get_help_text()
+        if plugin_help is not self._help_plugin_text:
+            self._help_texts = {
+                test_mode: base_help + plugin_help
+                for test_mode, base_help in BASE_HELP_TEXTS.items()
+            }
+            self._help_plugin_text = plugin_help
         
         await update.message.reply_text(
-            base_help_text + plugin_help, 
+            self._help_texts[self.test_mode],
             parse_mode="Markdown"
         )
     
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Process incoming messages and respond appropriately."""
-        if not self._is_user_allowed(update):
+        if not await self._is_user_allowed(update):
             return
         
         user_message = update.message.text
         user_id = update.effective_user.id
         username = update.effective_user.username
         
-        logger.info(f"Received message from {username} ({user_id}): {user_message}")
-        
-        # Show typing indicator
-        await send_typing_action(update)
+        # Formatting is deferred to loguru, so nothing is built when INFO is filtered out
+        logger.info("Received message from {} ({}): {:.200}", username, user_id, user_message)
         
-        # Process the message with Claude, passing the update object for conversation handling
-        response = await self._process_message(user_message, user_id, update)
+        # Updates run concurrently, but messages within one chat are handled in order
+        chat_id = update.effective_chat.id
+        chat_lock = self._chat_locks.get(chat_id)
+        if chat_lock is None:
+            chat_lock = self._chat_locks[chat_id] = asyncio.Lock()
         
-        # If it's a conversation state, don't respond here
-        if response == ConversationHandler.WAITING_FOR_CLIENT_CODE:
-            return self.WAITING_FOR_CLIENT_CODE
-        
-        # Otherwise, send the response
-        await update.message.reply_text(response)
+        async with chat_lock:
+            # Show typing indicator while Claude works; send_typing_action logs its own errors
+            typing_task = asyncio.create_task(send_typing_action(update))
+            
+            # Process the message with Claude, passing the update object for conversation handling
+            response = await self._process_message(user_message, user_id, update, context)
+            
+            # Make sure the typing indicator doesn't arrive after the reply
+            await typing_task
+            
+            # If it's a conversation state, don't respond here
+            if response == ConversationHandler.WAITING_FOR_CLIENT_CODE:
+                return self.WAITING_FOR_CLIENT_CODE
+            
+            # Otherwise, send the response
+            await update.message.reply_text(response)
     
-    async def _process_message(self, message: str, user_id: int, update: Optional[Update] = None) -> str:
+    async def _process_message(
+        self,
+        message: str,
+        user_id: int,
+        update: Optional[Update] = None,
+        context: Optional[ContextTypes.DEFAULT_TYPE] = None
+    ) -> str:
         """Process a message using Claude and extract work information if applicable."""
         try:
             # Analyze the message with Claude
             analysis = await self.claude.analyze_work_entry(message)
             
             # If work information was detected, save it
-            if analysis.get("is_work_entry", False):
-                work_data = {
-                    "date": analysis.get("date"),
-                    "client": analysis.get("client"),
-                    "project": analysis.get("project"),
-                    "hours": analysis.get("hours"),
-                    "billable": analysis.get("billable"),
-                    "description": analysis.get("description")
-                }
+            if analysis.is_work_entry:
+                client_name, hours, billable = analysis.client, analysis.hours, analysis.billable
+                work_data = analysis.model_dump(include=WORK_ENTRY_FIELDS)
                 
                 # Check if we have a client code for this client
-                client_name = work_data.get("client", "")
                 client_code = None
                 
                 if client_name:
@@ -178,42 +296,43 @@ class BramifyBot:
                 if client_code:
                     work_data["client_code"] = client_code
                     
-                    # Use the bot's test_mode setting
-                    success = self.sheets.add_work_entry(work_data, test_mode=self.test_mode)
+                    # Write to the sheet in the background so we can reply right away
+                    save_future = self._schedule_work_entry(work_data)
+                    if update and context:
+                        self._report_failed_write(save_future, update, context)
                     
                     # Prepare response
-                    response = f"✅ Ik heb je werk geregistreerd:\n\n"
-                    response += f"📅 Datum: {work_data['date']}\n"
-                    response += f"👥 Klant: {work_data['client']} ({client_code})\n"
-                    response += f"⏱️ Uren: {work_data['hours']}\n"
-                    response += f"💰 Declarabel: {'Ja' if work_data['billable'] else 'Nee'}\n"
-                    response += f"📝 Beschrijving: {work_data['description'][:50]}...\n"
+                    parts = [self._format_work_entry(WORK_ENTRY_SAVED_TEMPLATE, work_data)]
                     
                     # Show revenue for billable hours
-                    if work_data.get('billable', True) and work_data.get('hours'):
+                    if billable and hours:
                         hourly_rate = work_data.get('hourly_rate', 85)
-                        revenue = float(work_data['hours']) * hourly_rate
-                        response += f"💵 Omzet: €{revenue:.2f}\n\n"
+                        revenue = float(hours) * hourly_rate
+                        parts.append(f"💵 Omzet: €{revenue:.2f}\n\n")
                     else:
-                        response += "\n"
+                        parts.append("\n")
                     
                     if self.test_mode:
-                        response += f"🔍 Let op: Deze registratie is toegevoegd aan een testblad voor validatie. "
-                        response += f"Zodra je hebt bevestigd dat het correct werkt, kun je het commando /enableproduction "
-                        response += f"gebruiken om naar het echte urenblad te schrijven."
+                        parts.append(
+                            "🔍 Let op: Deze registratie is toegevoegd aan een testblad voor validatie. "
+                            "Zodra je hebt bevestigd dat het correct werkt, kun je het commando /enableproduction "
+                            "gebruiken om naar het echte urenblad te schrijven."
+                        )
                     
-                    return response
-                elif update:
+                    return "".join(parts)
+                elif update and context:
                     # We need a client code - store the work entry and ask for a code
-                    self.pending_work_entries[user_id] = work_data
+                    context.user_data[self.PENDING_WORK_ENTRY] = (time.monotonic(), work_data)
                     
                     # Suggest a code
                     suggested_code = self.client_mapper.suggest_code_for_client(client_name)
                     
                     # Ask for the client code
-                    prompt = f"Ik heb een 3-letter klantcode nodig voor '{client_name}'.\n\n"
-                    prompt += f"Voorgestelde code: {suggested_code}\n\n"
-                    prompt += "Voer een 3-letter code in voor deze klant (of gebruik de suggestie):"
+                    prompt = (
+                        f"Ik heb een 3-letter klantcode nodig voor '{client_name}'.\n\n"
+                        f"Voorgestelde code: {suggested_code}\n\n"
+                        "Voer een 3-letter code in voor deze klant (of gebruik de suggestie):"
+                    )
                     
                     await update.message.reply_text(prompt)
                     
@@ -231,31 +350,170 @@ class BramifyBot:
             logger.error(f"Error processing message: {e}")
             return "Sorry, ik ben een fout tegengekomen bij het verwerken van je bericht. Probeer het opnieuw."
     
+    @staticmethod
+    def _format_work_entry(template: str, work_data: Dict[str, Any]) -> str:
+        """
+        Fill a confirmation template with the details of a work entry.
+        
+        Args:
+            template: One of the work entry confirmation templates
+            work_data: The work entry, including its client code
+            
+        Returns:
+            The formatted confirmation text
+        """
+        # Display fields go in a separate dict, work_data itself is written to the sheet
+        return template.format_map({
+            **work_data,
+            "billable_nl": "Ja" if work_data["billable"] else "Nee",
+        })
+    
+    def _schedule_work_entry(self, work_data: Dict[str, Any]) -> asyncio.Future:
+        """
+        Queue a work entry to be written to Google Sheets in the next batch.
+        
+        Args:
+            work_data: The work entry to write
+            
+        Returns:
+            Future that resolves to True once the batch containing the entry was written
+        """
+        future = asyncio.get_running_loop().create_future()
+        if not self._accepting_work_entries:
+            logger.error("Bot is shutting down, work entry not saved")
+            future.set_result(False)
+            return future
+        if self._write_task is None or self._write_task.done():
+            logger.error("Work entry writer is not running, work entry not saved")
+            future.set_result(False)
+            return future
+        
+        self._work_entry_queue.put_nowait((work_data, self.test_mode, future))
+        return future
+    
+    def _report_failed_write(
+        self,
+        save_future: asyncio.Future,
+        update: Update,
+        context: ContextTypes.DEFAULT_TYPE
+    ) -> None:
+        """
+        Send a follow-up message if a work entry that was already confirmed isn't saved.
+        
+        Args:
+            save_future: Future returned by _schedule_work_entry
+            update: The update the confirmation was sent for
+            context: The callback context, used to track the follow-up task
+        """
+        def on_done(future: asyncio.Future) -> None:
+            if future.cancelled() or not future.result():
+                context.application.create_task(update.message.reply_text(WORK_ENTRY_FAILED_TEXT))
+        
+        save_future.add_done_callback(on_done)
+    
+    async def _flush_work_entries(self) -> None:
+        """
+        Background task that writes queued work entries to Google Sheets in batches.
+        
+        A None item in the queue stops the task once everything queued before it is written.
+        """
+        loop = asyncio.get_running_loop()
+        stopping = False
+        entries = []
+        
+        try:
+            while not stopping:
+                # Wait for the first entry, then collect more for a short window
+                item = await self._work_entry_queue.get()
+                if item is None:
+                    break
+                entries = [item]
+                deadline = loop.time() + self.WRITE_BATCH_WINDOW
+                
+                while len(entries) < self.WRITE_BATCH_SIZE:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._work_entry_queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                    if item is None:
+                        stopping = True
+                        break
+                    entries.append(item)
+                
+                await self._write_work_entries(entries)
+                entries = []
+                
+        except asyncio.CancelledError:
+            logger.info("Work entry writer task cancelled")
+            raise
+        finally:
+            # Nothing writes these entries anymore, so report them as not saved
+            while not self._work_entry_queue.empty():
+                item = self._work_entry_queue.get_nowait()
+                if item is not None:
+                    entries.append(item)
+            for _, _, future in entries:
+                if not future.done():
+                    future.set_result(False)
+    
+    async def _write_work_entries(self, entries: List[Tuple[Dict[str, Any], bool, asyncio.Future]]) -> None:
+        """
+        Write a batch of queued work entries and resolve their futures.
+        
+        Args:
+            entries: Queued (work_data, test_mode, future) tuples
+        """
+        try:
+            success = await asyncio.to_thread(
+                self.sheets.add_work_entries,
+                [(work_data, test_mode) for work_data, test_mode, _ in entries]
+            )
+            if not success:
+                logger.error(f"Failed to write {len(entries)} work entries to Google Sheets")
+        except Exception as e:
+            logger.error(f"Error writing work entries in background: {e}")
+            success = False
+        
+        # Report the outcome to anyone waiting for their entry
+        for _, _, future in entries:
+            if not future.done():
+                future.set_result(success)
+    
     async def error_handler(self, update: object, context: ContextTypes.DEFAULT_TYPE):
         """Handle errors in the Telegram bot."""
         logger.error(f"Error handling update: {context.error}")
     
-    def _is_user_allowed(self, update: Update) -> bool:
+    async def _is_user_allowed(self, update: Update) -> bool:
         """Check if the user is allowed to use the bot."""
-        user_id = update.effective_user.id
-        username = update.effective_user.username
-        
-        if not self.config.bot.allowed_user_ids:
-            # If no allowed users are specified, allow everyone (not recommended for production)
-            logger.warning("No allowed users specified, allowing all users")
+        if not self._allowed_ids:
+            # Everyone is allowed; warned about once at startup
             return True
-            
-        is_allowed = user_id in self.config.bot.allowed_user_ids
+        
+        user_id = update.effective_user.id
+        is_allowed = user_id in self._allowed_ids
         
         if not is_allowed:
+            username = update.effective_user.username
             logger.warning(f"Unauthorized access attempt by {username} ({user_id})")
-            update.message.reply_text("Sorry, you are not authorized to use this bot.")
+            
+            # Rate limit rejection replies so repeated probing doesn't flood the API
+            now = time.monotonic()
+            last_reply = self._reject_lru.get(user_id)
+            if last_reply is None or now - last_reply > self.REJECT_REPLY_WINDOW:
+                await update.message.reply_text("Sorry, you are not authorized to use this bot.")
+                self._reject_lru[user_id] = now
+                self._reject_lru.move_to_end(user_id)
+                while len(self._reject_lru) > self.REJECT_CACHE_SIZE:
+                    self._reject_lru.popitem(last=False)
             
         return is_allowed
     
     async def cmd_enable_production(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /enable_production command to switch to production mode."""
-        if not self._is_user_allowed(update):
+        if not await self._is_user_allowed(update):
             return
             
         self.test_mode = False
@@ -266,7 +524,7 @@ class BramifyBot:
         
     async def cmd_test_mode(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /test_mode command to switch to test mode."""
-        if not self._is_user_allowed(update):
+        if not await self._is_user_allowed(update):
             return
             
         self.test_mode = True
@@ -277,7 +535,7 @@ class BramifyBot:
         
     async def cmd_list_clients(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /list_clients command to show existing client codes."""
-        if not self._is_user_allowed(update):
+        if not await self._is_user_allowed(update):
             return
             
         # Get all client mappings
@@ -289,21 +547,20 @@ class BramifyBot:
             )
             return
         
-        # Format the list of clients
-        response = "📋 **Klantcodes**\n\n"
-        for client_name, code in mappings.items():
-            # Show the original name if possible
-            response += f"• `{code}` - {client_name}\n"
+        # Format the list of clients, reusing the last rendering if nothing changed
+        version, response = self._client_list_cache
+        if version != self.client_mapper.version:
+            response = "📋 **Klantcodes**\n\n" + "".join(
+                f"• `{code}` - {client_name}\n" for client_name, code in mappings.items()
+            )
+            self._client_list_cache = (self.client_mapper.version, response)
         
         await update.message.reply_text(response, parse_mode="Markdown")
     
     async def cancel_conversation(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         """Cancel the current conversation."""
-        user_id = update.effective_user.id
-        
         # Clear any pending work entries
-        if user_id in self.pending_work_entries:
-            del self.pending_work_entries[user_id]
+        context.user_data.pop(self.PENDING_WORK_ENTRY, None)
         
         await update.message.reply_text(
             "Operatie geannuleerd.",
@@ -312,27 +569,48 @@ class BramifyBot:
         
         return ConversationHandler.END
     
+    def _get_pending_entry(self, context: ContextTypes.DEFAULT_TYPE) -> Optional[Dict[str, Any]]:
+        """
+        Get the work entry waiting for a client code, dropping it once it has expired.
+        
+        Args:
+            context: The callback context holding the user's data
+            
+        Returns:
+            The pending work entry, or None if there is none or it expired
+        """
+        pending = context.user_data.get(self.PENDING_WORK_ENTRY)
+        if pending is None:
+            return None
+        
+        created, work_data = pending
+        age = time.monotonic() - created
+        if age > self.PENDING_ENTRY_TTL:
+            del context.user_data[self.PENDING_WORK_ENTRY]
+            logger.info("Pending work entry for {} expired after {:.0f}s", work_data.get("client"), age)
+            return None
+        
+        return work_data
+    
     async def handle_client_code(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         """Handle client code input during conversation."""
-        if not self._is_user_allowed(update):
+        if not await self._is_user_allowed(update):
             return ConversationHandler.END
         
-        user_id = update.effective_user.id
         user_input = update.message.text.strip()
         
-        # Check if we have a pending work entry for this user
-        if user_id not in self.pending_work_entries:
+        # Get the pending work entry for this user
+        work_data = self._get_pending_entry(context)
+        if work_data is None:
             await update.message.reply_text(
                 "Geen openstaande urenregistratie gevonden. Begin opnieuw."
             )
             return ConversationHandler.END
         
-        # Get the pending work entry
-        work_data = self.pending_work_entries[user_id]
         client_name = work_data.get("client", "Unknown")
         
         # Normalize and validate the client code
-        if user_input and len(user_input) >= 1:
+        if CLIENT_CODE_RE.match(user_input):
             # Add the mapping
             self.client_mapper.add_mapping(client_name, user_input)
             
@@ -340,32 +618,26 @@ class BramifyBot:
             normalized_code = self.client_mapper._normalize_code(user_input)
             work_data["client_code"] = normalized_code
             
-            # Save the work entry
-            success = self.sheets.add_work_entry(work_data, test_mode=self.test_mode)
+            # Queue the work entry for the batch writer while the reply is prepared
+            save_future = self._schedule_work_entry(work_data)
             
             # Clear the pending entry
-            del self.pending_work_entries[user_id]
+            del context.user_data[self.PENDING_WORK_ENTRY]
             
-            if success:
-                # Prepare response message
-                response = f"✅ Urenregistratie opgeslagen met klantcode: {normalized_code}\n\n"
-                response += f"📅 Datum: {work_data['date']}\n"
-                response += f"👥 Klant: {work_data['client']} ({normalized_code})\n"
-                response += f"⏱️ Uren: {work_data['hours']}\n"
-                response += f"💰 Declarabel: {'Ja' if work_data['billable'] else 'Nee'}\n"
-                response += f"📝 Beschrijving: {work_data['description'][:50]}...\n"
-                
-                if self.test_mode:
-                    response += f"\n🔍 Let op: Deze registratie is toegevoegd aan een testblad voor validatie. "
-                    response += f"Gebruik /enable_production om naar het echte urenblad te schrijven."
-                
-                await update.message.reply_text(response, reply_markup=ReplyKeyboardRemove())
+            # Prepare response message
+            parts = [self._format_work_entry(CLIENT_CODE_SAVED_TEMPLATE, work_data)]
+            
+            if self.test_mode:
+                parts.append(
+                    "\n🔍 Let op: Deze registratie is toegevoegd aan een testblad voor validatie. "
+                    "Gebruik /enable_production om naar het echte urenblad te schrijven."
+                )
+            
+            if await save_future:
+                await update.message.reply_text("".join(parts), reply_markup=ReplyKeyboardRemove())
                 return ConversationHandler.END
             else:
-                await update.message.reply_text(
-                    "❌ Kon de urenregistratie niet opslaan. Probeer het opnieuw.",
-                    reply_markup=ReplyKeyboardRemove()
-                )
+                await update.message.reply_text(WORK_ENTRY_FAILED_TEXT, reply_markup=ReplyKeyboardRemove())
                 return ConversationHandler.END
         else:
             # Invalid input
@@ -377,12 +649,92 @@ class BramifyBot:
     async def setup(self):
         """Set up the bot, including loading plugins."""
         logger.info("Setting up Bramify")
+        
+        # Size the pool used by asyncio.to_thread for the blocking API clients
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=self.EXECUTOR_WORKERS, thread_name_prefix="bramify")
+        )
+        
         await self.plugin_manager.load_plugins()
+        
+        # Start the background writer for queued work entries
+        self._write_task = asyncio.create_task(self._flush_work_entries())
+    
+    async def _on_shutdown(self, application: Application) -> None:
+        """Write the remaining queued work entries and release long-lived connections."""
+        # Stop accepting entries, then let the writer finish the queue and exit
+        self._accepting_work_entries = False
+        if self._write_task is not None and not self._write_task.done():
+            self._work_entry_queue.put_nowait(None)
+            try:
+                await asyncio.wait_for(self._write_task, self.SHUTDOWN_WRITE_TIMEOUT)
+            except asyncio.TimeoutError:
+                # wait_for has cancelled the writer
+                logger.error("Timed out writing queued work entries on shutdown")
+        
+        await self.claude.close()
     
     async def run(self):
         """Run the bot with setup."""
-        logger.info("Setting up Bramify")
         await self.setup()
         
         logger.info("Starting Telegram bot")
-        self.app.run_polling()
\ No newline at end of file
+        self.start()
+    
+    def start(self, close_loop: bool = True):
+        """
+        Start receiving Telegram updates using the configured transport.
+        
+        Args:
+            close_loop: Whether to close the event loop when the bot stops
+        """
+        if self._bot_config.mode == "webhook":
+            self.run_webhook(close_loop=close_loop)
+        else:
+            self.run_polling(close_loop=close_loop)
+    
+    def run_polling(self, close_loop: bool = True):
+        """
+        Run the Telegram bot using long polling.
+        
+        Args:
+            close_loop: Whether to close the event loop when polling stops
+        """
+        # A single getUpdates call blocks server-side until updates arrive,
+        # instead of the bot waking up for many short polls while idle.
+        # Any configured webhook is removed by PTB before polling starts.
+        self.app.run_polling(
+            poll_interval=0,
+            timeout=self.POLL_TIMEOUT,
+            bootstrap_retries=-1,
+            allowed_updates=self.ALLOWED_UPDATES,
+            close_loop=close_loop
+        )
+    
+    def run_webhook(self, close_loop: bool = True):
+        """
+        Run the Telegram bot as a webhook server.
+        
+        Telegram pushes updates to the configured URL, so the bot does no
+        background requests while idle.
+        
+        Args:
+            close_loop: Whether to close the event loop when the server stops
+        """
+        bot_config = self._bot_config
+        if not bot_config.webhook_url:
+            raise ValueError("TELEGRAM_WEBHOOK_URL not set in environment variables")
+        
+        # The token as path keeps the endpoint unguessable; PTB sets the webhook on startup
+        url_path = self._token
+        logger.info(f"Starting webhook server on port {bot_config.webhook_port}")
+        self.app.run_webhook(
+            listen="0.0.0.0",
+            port=bot_config.webhook_port,
+            url_path=url_path,
+            webhook_url=f"{bot_config.webhook_url.rstrip('/')}/{url_path}",
+            secret_token=bot_config.webhook_secret,
+            allowed_updates=self.ALLOWED_UPDATES,
+            bootstrap_retries=-1,
+            close_loop=close_loop
+        )
\ No newline at end of file
@@ -1,56 +1,75 @@
 """Configuration management for Bramify."""
 
 import os
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel
+import functools
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, FrozenSet
 from dotenv import load_dotenv
 
-class BotConfig(BaseModel):
+@dataclass(slots=True, frozen=True)
+class BotConfig:
     """Bot configuration model."""
     telegram_token: str
-    allowed_user_ids: List[int]
+    allowed_user_ids: FrozenSet[int]
+    mode: str = "polling"
+    webhook_url: Optional[str] = None
+    webhook_port: int = 8443
+    webhook_secret: Optional[str] = None
     
-class ClaudeConfig(BaseModel):
+@dataclass(slots=True, frozen=True)
+class ClaudeConfig:
     """Claude API configuration model."""
     api_key: str
-    model: str = "claude-3-opus-20240229"
+    model: str = "claude-3-haiku-20240307"
+    extract_model: str = "claude-3-haiku-20240307"
     
-class GoogleSheetsConfig(BaseModel):
+@dataclass(slots=True, frozen=True)
+class GoogleSheetsConfig:
     """Google Sheets configuration model."""
     credentials_file: str
-    token_file: Optional[str] = None
     spreadsheet_id: str
+    token_file: Optional[str] = None
     
-class AppConfig(BaseModel):
+@dataclass(slots=True, frozen=True)
+class AppConfig:
     """Main application configuration model."""
     bot: BotConfig
     claude: ClaudeConfig
     sheets: GoogleSheetsConfig
     debug: bool = False
 
+@functools.lru_cache(maxsize=1)
 def load_config() -> AppConfig:
     """
     Load application configuration from environment variables.
     
+    The configuration is read once per process; call load_config.cache_clear()
+    to pick up changed environment variables.
+    
     Returns:
         AppConfig object with all configuration values
     """
     # Make sure environment variables are loaded
     load_dotenv()
     
-    # Parse allowed user IDs
+    # Parse allowed user IDs into a frozenset for constant-time membership checks
     allowed_users_str = os.getenv("TELEGRAM_ALLOWED_USER_IDS", "")
-    allowed_user_ids = [int(uid.strip()) for uid in allowed_users_str.split(",") if uid.strip()]
+    allowed_user_ids = frozenset(int(uid.strip()) for uid in allowed_users_str.split(",") if uid.strip())
     
     # Create config objects
     bot_config = BotConfig(
         telegram_token=os.getenv("TELEGRAM_BOT_TOKEN", ""),
-        allowed_user_ids=allowed_user_ids
+        allowed_user_ids=allowed_user_ids,
+        mode=os.getenv("TELEGRAM_MODE", "polling").lower(),
+        webhook_url=os.getenv("TELEGRAM_WEBHOOK_URL") or None,
+        webhook_port=int(os.getenv("TELEGRAM_WEBHOOK_PORT", "8443")),
+        webhook_secret=os.getenv("TELEGRAM_WEBHOOK_SECRET") or None
     )
     
     claude_config = ClaudeConfig(
         api_key=os.getenv("ANTHROPIC_API_KEY", ""),
-        model=os.getenv("ANTHROPIC_MODEL", "claude-3-opus-20240229")
+        model=os.getenv("ANTHROPIC_MODEL", "claude-3-haiku-20240307"),
+        extract_model=os.getenv("ANTHROPIC_EXTRACT_MODEL", "claude-3-haiku-20240307")
     )
     
     sheets_config = GoogleSheetsConfig(
@@ -1,42 +1,59 @@
 """Plugin management system for Bramify."""
 
 import os
+import asyncio
 import importlib
 from typing import Dict, List, Type, Optional
 from loguru import logger
 
 from telegram.ext import Application
 from plugins.plugin_base import PluginBase
+from plugins.summary_plugin import SummaryPlugin
+from integrations.google_sheets.client import get_sheets_client
 
 class PluginManager:
     """Manager for loading, enabling, and disabling plugins."""
     
-    def __init__(self, telegram_app: Application):
+    def __init__(self, telegram_app: Application, sheets_client=None):
         """
         Initialize the plugin manager.
         
         Args:
             telegram_app: The Telegram application instance
+            sheets_client: Google Sheets client to share with plugins, defaults
+                to the process-wide client
         """
         self.telegram_app = telegram_app
+        self.sheets_client = sheets_client
         self.plugins: Dict[str, PluginBase] = {}
         self.plugin_classes: Dict[str, Type[PluginBase]] = {}
         
+        # Help text for enabled plugins, rebuilt only when plugins change
+        self._help_text: Optional[str] = None
+        
     async def load_plugins(self) -> None:
         """Load and initialize all available plugins."""
         # This could be expanded to scan a directory or load from configuration
-        from plugins.summary_plugin import SummaryPlugin
-        from integrations.google_sheets.client import GoogleSheetsClient
-        
-        # Create instances of required dependencies
-        sheets_client = GoogleSheetsClient()
+        # Plugins share the bot's Google Sheets client
+        sheets_client = self.sheets_client
+        if sheets_client is None:
+            sheets_client = self.sheets_client = get_sheets_client()
         
         # Register plugin classes
         self.register_plugin_class("summary", SummaryPlugin, sheets_client)
         
-        # Initialize all registered plugins
-        for plugin_id, (plugin_class, args) in self.plugin_classes.items():
-            await self.initialize_plugin(plugin_id, plugin_class, *args)
+        # Initialize all registered plugins concurrently
+        results = await asyncio.gather(
+            *(
+                self.initialize_plugin(plugin_id, plugin_class, *args)
+                for plugin_id, (plugin_class, args) in self.plugin_classes.items()
+            ),
+            return_exceptions=True
+        )
+        
+        for plugin_id, result in zip(self.plugin_classes, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error initializing plugin {plugin_id}: {result}")
     
     def register_plugin_class(
         self, 
@@ -85,6 +102,7 @@ class PluginManager:
                 
                 # Store the plugin instance
                 self.plugins[plugin_id] = plugin
+                self._help_text = None
                 
                 logger.info(f"Initialized plugin: {plugin.name}")
                 return True
@@ -130,6 +148,7 @@ class PluginManager:
         plugin = self.get_plugin(plugin_id)
         if plugin:
             plugin.enabled = False
+            self._help_text = None
             logger.info(f"Disabled plugin: {plugin.name}")
             return True
         return False
@@ -147,6 +166,7 @@ class PluginManager:
         plugin = self.get_plugin(plugin_id)
         if plugin:
             plugin.enabled = True
+            self._help_text = None
             logger.info(f"Enabled plugin: {plugin.name}")
             return True
         return False
@@ -167,10 +187,9 @@ class PluginManager:
         Returns:
             Formatted help text
         """
-        help_text = "*Available Plugins:*\n\n"
-        
-        for plugin in self.get_all_plugins():
-            if plugin.enabled:
-                help_text += f"{plugin.get_help()}\n\n"
+        if self._help_text is None:
+            self._help_text = "*Available Plugins:*\n\n" + "".join(
+                f"{plugin.get_help()}\n\n" for plugin in self.plugins.values() if plugin.enabled
+            )
                 
-        return help_text
\ No newline at end of file
+        return self._help_text
\ No newline at end of file
@@ -2,30 +2,294 @@
 
 import os
 import re
-from typing import Dict, Any, Optional
-import json
-from datetime import datetime, timedelta
+import asyncio
+import functools
+from typing import List, Optional, Tuple
+from datetime import date, datetime, timedelta
 import anthropic
+import httpx
 from loguru import logger
+from pydantic import BaseModel, ValidationError, field_validator
+
+from utils.cache import TTLCache, normalize_text
+from utils.rate_limit import RateLimiter
+from utils.date_utils import resolve_dutch_relative_date
+
+# Date formats Claude may answer with
+DMY_DATE_RE = re.compile(r"(\d{2})-(\d{2})-(\d{4})")
+ISO_DATE_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})")
+SLASH_DATE_RE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})")
+
+# First number in an answer like "4 uur", "3,5" or "€85"
+NUMBER_RE = re.compile(r"-?\d+(?:[.,]\d+)?")
+
+# Dutch yes/no answers for the billable field
+DUTCH_BOOLEANS = {"ja": True, "nee": False}
+
+class WorkEntry(BaseModel):
+    """Work entry information extracted by Claude."""
+    is_work_entry: bool = False
+    client: Optional[str] = None
+    project: Optional[str] = None
+    hours: Optional[float] = None
+    billable: bool = True
+    date: Optional[str] = None
+    description: Optional[str] = None
+    hourly_rate: Optional[float] = None
+    
+    # Shortened description for confirmations, filled in after parsing
+    description_preview: str = ""
+    
+    @field_validator("hours", "hourly_rate", mode="before")
+    @classmethod
+    def parse_number(cls, value):
+        """
+        Read a number from answers with a unit or a decimal comma, like "4 uur" or "3,5".
+        
+        Args:
+            value: The value as returned by Claude
+            
+        Returns:
+            The number, or the value unchanged if it isn't a string with a number
+        """
+        if isinstance(value, str):
+            match = NUMBER_RE.search(value)
+            if match:
+                return float(match.group(0).replace(",", "."))
+            if not value.strip():
+                return None
+        return value
+    
+    @field_validator("is_work_entry", "billable", mode="before")
+    @classmethod
+    def default_for_null(cls, value, info):
+        """
+        Use the field's default for null and read Dutch yes/no answers.
+        
+        Args:
+            value: The value as returned by Claude
+            info: Validation info with the field name
+            
+        Returns:
+            The field's default for null, otherwise the (translated) value
+        """
+        if value is None:
+            return cls.model_fields[info.field_name].default
+        if isinstance(value, str):
+            return DUTCH_BOOLEANS.get(value.strip().lower(), value)
+        return value
+    
+    @field_validator("date")
+    @classmethod
+    def normalize_date(cls, value: Optional[str]) -> Optional[str]:
+        """
+        Normalize the date to the DD-MM-YYYY format used in the sheet.
+        
+        Args:
+            value: The date as returned by Claude
+            
+        Returns:
+            The date as DD-MM-YYYY, or None if it is missing or unrecognized
+        """
+        if not value or DMY_DATE_RE.match(value):
+            return value or None
+        
+        match = ISO_DATE_RE.match(value)
+        if match:
+            year, month, day = match.groups()
+            return f"{day}-{month}-{year}"
+        
+        match = SLASH_DATE_RE.match(value)
+        if match:
+            # Day first, unless only a month-first (US) reading is valid
+            day, month, year = match.groups()
+            if int(month) > 12 >= int(day):
+                day, month = month, day
+            return f"{day.zfill(2)}-{month.zfill(2)}-{year}"
+        
+        logger.warning(f"Unrecognized date format: {value}, using today's date")
+        return None
+
+# Static instructions for work entry analysis, sent as the system prompt
+ANALYSIS_SYSTEM_PROMPT = """
+You are an assistant that helps extract work information from text.
+The user is from the Netherlands and will often write in Dutch or a mix of Dutch and English.
+
+The spreadsheet has the following columns:
+- Datum (Date)
+- Klant (Client) 
+- Beschrijving (Description)
+- Uren (Hours - billable)
+- Uren onbetaald (Unbillable hours)
+- Omzet (Revenue)
+
+Important Dutch vocabulary to help you understand:
+- "uur" or "uren" = hours
+- "klant" = client
+- "vandaag" = today
+- "gisteren" = yesterday
+- "vorige week" = last week
+- "declarabel" or "facturabel" = billable
+- "niet declarabel" or "niet facturabel" = not billable
+- "onbetaald" = unpaid/unbillable
+
+Analyze the text you are given and extract:
+
+1. If this is a work entry (description of work done)
+2. Client name (klant)
+3. Hours worked (uren)
+4. Whether the work is billable (facturabel) - default to true if unclear
+5. Date (datum) - use today if not specified, format as DD-MM-YYYY for Dutch format
+   For references like "morgen" (tomorrow) or "volgende week" (next week), calculate the actual date.
+6. Description of the work (beschrijving)
+
+Format your response as ONLY valid JSON with the following fields:
+{
+    "is_work_entry": true/false,
+    "client": "client name or null if not found",
+    "hours": number of hours or null if not found,
+    "billable": true/false,
+    "date": "DD-MM-YYYY",
+    "description": "description of the work",
+    "hourly_rate": 85
+}
+"""
+
+ANALYSIS_USER_TEMPLATE = """
+Important date references:
+- Today is {today}
+- Tomorrow is {tomorrow}
+- Yesterday is {yesterday}
+
+User text: {text}
+"""
+
+# Sent once when a reply doesn't validate, after Claude's reply
+ANALYSIS_RETRY_TEMPLATE = """
+Your answer doesn't match the requested format: {errors}.
+Reply with ONLY the corrected JSON object.
+"""
+
+# Used when the date was already resolved locally, so Claude only copies it
+ANALYSIS_DATED_USER_TEMPLATE = """
+The work was done on {date}.
+
+User text: {text}
+"""
+
+CHAT_SYSTEM_PROMPT = """
+Je bent Bramify, een persoonlijke assistent gespecialiseerd in urenregistratie.
+Je helpt gebruikers hun werkuren bij te houden op een vriendelijke, conversationele manier.
+Wees beknopt, behulpzaam, en houd een professionele maar vriendelijke toon aan.
+Antwoord altijd in het Nederlands, ook als de gebruiker in het Engels schrijft.
+"""
+
+# Outermost {...} region of a reply that may have prose around the JSON
+JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+@functools.lru_cache(maxsize=1)
+def reference_dates(day: date) -> Tuple[str, str, str]:
+    """
+    Format the date references used in the analysis prompt, once per day.
+    
+    Args:
+        day: Today's date
+        
+    Returns:
+        Today, tomorrow and yesterday formatted as DD-MM-YYYY
+    """
+    return (
+        day.strftime('%d-%m-%Y'),
+        (day + timedelta(days=1)).strftime('%d-%m-%Y'),
+        (day - timedelta(days=1)).strftime('%d-%m-%Y')
+    )
 
 class ClaudeClient:
     """Client for interacting with Anthropic's Claude API."""
     
+    # Maximum number of Claude requests in flight at the same time
+    MAX_CONCURRENT_REQUESTS = 8
+    
+    # Requests sent per minute, kept under the API's rate limit so bursts wait
+    # here instead of failing with 429 errors
+    MAX_REQUESTS_PER_MINUTE = 50
+    
+    # Retries for 429, 529 and connection errors; the SDK backs off exponentially
+    # with jitter and honors the retry-after header
+    MAX_RETRIES = 4
+    
+    # Recent analyses and chat replies kept for repeated messages
+    ANALYSIS_CACHE_SIZE = 512
+    ANALYSIS_CACHE_TTL = 24 * 60 * 60
+    CHAT_CACHE_SIZE = 256
+    CHAT_CACHE_TTL = 60 * 60
+    
+    # The extracted JSON object is ~200 tokens; chat replies may be longer
+    ANALYSIS_MAX_TOKENS = 300
+    CHAT_MAX_TOKENS = 1000
+    
     def __init__(self):
         """Initialize the Claude client with API key."""
         api_key = os.getenv("ANTHROPIC_API_KEY")
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY not set in environment variables")
             
-        # Create the Anthropic client with the API key
-        self.client = anthropic.Anthropic(api_key=api_key)
+        # Create the async Anthropic client; its connection pool is kept for the process
+        self.client = anthropic.AsyncAnthropic(
+            api_key=api_key,
+            max_retries=self.MAX_RETRIES,
+            timeout=30.0,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=30.0)
+            )
+        )
         
-        # Define the model to use - using Claude 3 Haiku which is good for these tasks
+        # Define the models to use - Claude 3 Haiku is good for these tasks and much
+        # faster and cheaper than Sonnet or Opus; chat can be switched to a larger
+        # model while work entry extraction stays pinned to Haiku
         self.model = os.getenv("ANTHROPIC_MODEL", "claude-3-haiku-20240307")
+        self.extract_model = os.getenv("ANTHROPIC_EXTRACT_MODEL", "claude-3-haiku-20240307")
+        
+        # Bound parallel requests now that updates are handled concurrently
+        self._semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        self._rate_limiter = RateLimiter(self.MAX_REQUESTS_PER_MINUTE, 60)
+        
+        # (date, normalized message) -> WorkEntry
+        self._analysis_cache = TTLCache(self.ANALYSIS_CACHE_SIZE, self.ANALYSIS_CACHE_TTL)
         
-        logger.info(f"Claude client initialized with model {self.model}")
+        # (date, normalized message) -> running analysis request
+        self._inflight_analyses = {}
+        
+        # Normalized message -> chat reply
+        self._chat_cache = TTLCache(self.CHAT_CACHE_SIZE, self.CHAT_CACHE_TTL)
+        
+        logger.info(f"Claude client initialized with model {self.model} (extraction: {self.extract_model})")
+    
+    async def close(self) -> None:
+        """
+        Close the pooled HTTP connections to the Anthropic API.
+        
+        If this is the shared client, get_claude_client creates a new one on its next call.
+        """
+        # Its connections and locks can't be reused, so stop handing this client out
+        if get_claude_client.cache_info().currsize and get_claude_client() is self:
+            get_claude_client.cache_clear()
+        await self.client.close()
+    
+    async def _create_message(self, **kwargs):
+        """
+        Send a Messages API request, bounded by the rate and concurrency limits.
+        
+        Args:
+            **kwargs: Arguments for messages.create
+            
+        Returns:
+            The Messages API response
+        """
+        async with self._rate_limiter, self._semaphore:
+            return await self.client.messages.create(**kwargs)
     
-    async def analyze_work_entry(self, text: str) -> Dict[str, Any]:
+    async def analyze_work_entry(self, text: str) -> WorkEntry:
         """
         Analyze text to extract work entry information.
         
@@ -33,132 +297,140 @@ class ClaudeClient:
             text: The text message from the user
             
         Returns:
-            Dict containing extracted work information or empty if not a work entry
-        """
-        system_prompt = """
-        You are an assistant that helps extract work information from text.
-        The user is from the Netherlands and will often write in Dutch or a mix of Dutch and English.
-        
-        The spreadsheet has the following columns:
-        - Datum (Date)
-        - Klant (Client) 
-        - Beschrijving (Description)
-        - Uren (Hours - billable)
-        - Uren onbetaald (Unbillable hours)
-        - Omzet (Revenue)
-        
-        Important Dutch vocabulary to help you understand:
-        - "uur" or "uren" = hours
-        - "klant" = client
-        - "vandaag" = today
-        - "gisteren" = yesterday
-        - "vorige week" = last week
-        - "declarabel" or "facturabel" = billable
-        - "niet declarabel" or "niet facturabel" = not billable
-        - "onbetaald" = unpaid/unbillable
-        
-        Format your response as ONLY valid JSON with the following fields:
-        {
-            "is_work_entry": true/false,
-            "client": "client name or null if not found",
-            "hours": number of hours or null if not found,
-            "billable": true/false,
-            "date": "DD-MM-YYYY",
-            "description": "description of the work",
-            "hourly_rate": 85
-        }
-        """
-        
-        # Get current date for reference
-        today = datetime.now()
-        tomorrow = today + timedelta(days=1)
-        yesterday = today - timedelta(days=1)
-        
-        user_prompt = f"""
-        Analyze the following text and extract:
-        
-        1. If this is a work entry (description of work done)
-        2. Client name (klant)
-        3. Hours worked (uren)
-        4. Whether the work is billable (facturabel) - default to true if unclear
-        5. Date (datum) - use today if not specified, format as DD-MM-YYYY for Dutch format
-        
-        Important date references:
-        - Today is {today.strftime('%d-%m-%Y')}
-        - Tomorrow is {tomorrow.strftime('%d-%m-%Y')}
-        - Yesterday is {yesterday.strftime('%d-%m-%Y')}
-        
-        For references like "morgen" (tomorrow) or "volgende week" (next week), calculate the actual date.
-        
-        6. Description of the work (beschrijving)
-        
-        User text: {text}
+            WorkEntry with the extracted work information, or a WorkEntry with
+            is_work_entry set to False if the text is not a work entry
         """
+        # Relative dates like "vandaag" resolve differently per day, so the date is part of the key
+        today = datetime.now().date()
+        cache_key = (today, normalize_text(text))
+        cached = self._analysis_cache.get(cache_key)
+        if cached is not None:
+            return cached.model_copy()
+        
+        # Identical messages that arrive while a request is running share its result
+        request = self._inflight_analyses.get(cache_key)
+        if request is None:
+            request = asyncio.ensure_future(self._request_analysis(text, today))
+            self._inflight_analyses[cache_key] = request
+            request.add_done_callback(lambda _: self._inflight_analyses.pop(cache_key, None))
+        
+        # Shielded so one cancelled caller doesn't cancel the request for the others
+        result = await asyncio.shield(request)
+        if result is None:
+            return WorkEntry(is_work_entry=False)
+        
+        # Only successful analyses are cached, so failures are retried
+        self._analysis_cache.put(cache_key, result)
+        return result.model_copy()
+    
+    async def analyze_work_entries(self, texts: List[str]) -> List[WorkEntry]:
+        """
+        Analyze several texts at once, e.g. when catching up on a week of hours.
+        
+        The requests run concurrently, bounded by MAX_CONCURRENT_REQUESTS, and
+        share the cache and in-flight deduplication of analyze_work_entry.
+        
+        Args:
+            texts: The text messages from the user
+            
+        Returns:
+            One WorkEntry per text, in the same order
+        """
+        return list(await asyncio.gather(*(self.analyze_work_entry(text) for text in texts)))
+    
+    async def _request_analysis(self, text: str, today: date) -> Optional[WorkEntry]:
+        """
+        Ask Claude to extract work entry information from text.
+        
+        Args:
+            text: The text message from the user
+            today: Today's date, used for relative date references
+            
+        Returns:
+            The extracted WorkEntry, or None if the request or parsing failed
+        """
+        # Relative Dutch dates are resolved here instead of leaving the arithmetic to Claude
+        local_date = resolve_dutch_relative_date(text, today)
+        if local_date is not None:
+            user_prompt = ANALYSIS_DATED_USER_TEMPLATE.format(date=local_date.strftime('%d-%m-%Y'), text=text)
+        else:
+            # Only the dates and the user text change between calls
+            today_str, tomorrow_str, yesterday_str = reference_dates(today)
+            user_prompt = ANALYSIS_USER_TEMPLATE.format(
+                today=today_str,
+                tomorrow=tomorrow_str,
+                yesterday=yesterday_str,
+                text=text
+            )
         
         try:
             # Create a message with the Claude client using Messages API
-            # Note: with newer versions of Anthropic client, this is not an async method
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=1000,
-                system=system_prompt,
-                messages=[
-                    {"role": "user", "content": user_prompt}
-                ]
+            messages = [{"role": "user", "content": user_prompt}]
+            response = await self._create_message(
+                model=self.extract_model,
+                max_tokens=self.ANALYSIS_MAX_TOKENS,
+                system=ANALYSIS_SYSTEM_PROMPT,
+                messages=messages
             )
             
             # Extract the response text
             response_text = response.content[0].text
             
-            # Extract JSON from the response (in case there's additional text)
-            json_start = response_text.find("{")
-            json_end = response_text.rfind("}") + 1
-            
-            if json_start >= 0 and json_end > json_start:
-                json_str = response_text[json_start:json_end]
-                result = json.loads(json_str)
-            else:
-                # If no valid JSON found, attempt to parse the whole response
-                result = json.loads(response_text)
-            
-            # Set date to today if not provided
-            if "date" not in result or not result["date"]:
-                result["date"] = datetime.now().strftime("%d-%m-%Y")
-            
-            # Validate date format and fix if needed
-            if "date" in result and result["date"]:
-                try:
-                    # Try to parse the date to ensure it's valid
-                    date_str = result["date"]
-                    
-                    # Check if it's in the expected DD-MM-YYYY format
-                    if re.match(r'\d{2}-\d{2}-\d{4}', date_str):
-                        # Already in the correct format
-                        pass
-                    elif re.match(r'\d{4}-\d{2}-\d{2}', date_str):
-                        # ISO format (YYYY-MM-DD), convert to DD-MM-YYYY
-                        year, month, day = date_str.split('-')
-                        result["date"] = f"{day}-{month}-{year}"
-                    elif re.match(r'\d{1,2}/\d{1,2}/\d{4}', date_str):
-                        # US format (MM/DD/YYYY or DD/MM/YYYY), assuming DD/MM/YYYY
-                        day, month, year = date_str.split('/')
-                        result["date"] = f"{day.zfill(2)}-{month.zfill(2)}-{year}"
-                    else:
-                        # Unrecognized format, use today
-                        logger.warning(f"Unrecognized date format: {date_str}, using today's date")
-                        result["date"] = datetime.now().strftime("%d-%m-%Y")
-                except Exception as e:
-                    logger.error(f"Error validating date format: {e}, using today's date")
-                    result["date"] = datetime.now().strftime("%d-%m-%Y")
-                
+            try:
+                result = self._parse_analysis(response_text)
+            except ValidationError as e:
+                # Ask once more, telling Claude what was wrong with its answer
+                errors = "; ".join(
+                    f"{'.'.join(str(part) for part in error['loc']) or 'reply'}: {error['msg']}"
+                    for error in e.errors(include_url=False)
+                )
+                logger.warning(f"Invalid work entry analysis, asking again: {errors}")
+                response = await self._create_message(
+                    model=self.extract_model,
+                    max_tokens=self.ANALYSIS_MAX_TOKENS,
+                    system=ANALYSIS_SYSTEM_PROMPT,
+                    messages=messages + [
+                        {"role": "assistant", "content": response_text.strip() or "{}"},
+                        {"role": "user", "content": ANALYSIS_RETRY_TEMPLATE.format(errors=errors)}
+                    ]
+                )
+                result = self._parse_analysis(response.content[0].text)
+            
+            # Shape the display text once here instead of in every reply
+            result.description_preview = (result.description or "")[:50]
+            
+            # A locally resolved date wins over Claude's answer
+            if local_date is not None:
+                result.date = local_date.strftime('%d-%m-%Y')
+            
+            # Set date to today if not provided or not recognized
+            if not result.date:
+                result.date = datetime.now().strftime("%d-%m-%Y")
+            
             return result
                 
         except Exception as e:
             logger.error(f"Error analyzing work entry: {e}")
-            # Return empty result on error
-            return {
-                "is_work_entry": False
-            }
+            return None
+    
+    @staticmethod
+    def _parse_analysis(response_text: str) -> WorkEntry:
+        """
+        Parse Claude's analysis reply into a WorkEntry.
+        
+        Args:
+            response_text: The reply text, possibly with prose around the JSON
+            
+        Returns:
+            The parsed WorkEntry
+            
+        Raises:
+            ValidationError: If the reply isn't valid JSON for a WorkEntry
+        """
+        # Extract JSON from the response (in case there's additional text),
+        # otherwise attempt to parse the whole response
+        match = JSON_OBJECT_RE.search(response_text)
+        return WorkEntry.model_validate_json(match.group(0) if match else response_text)
     
     async def generate_response(self, message: str) -> str:
         """
@@ -170,27 +442,36 @@ class ClaudeClient:
         Returns:
             The assistant's response
         """
+        cache_key = normalize_text(message)
+        cached = self._chat_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            system_prompt = """
-            Je bent Bramify, een persoonlijke assistent gespecialiseerd in urenregistratie.
-            Je helpt gebruikers hun werkuren bij te houden op een vriendelijke, conversationele manier.
-            Wees beknopt, behulpzaam, en houd een professionele maar vriendelijke toon aan.
-            Antwoord altijd in het Nederlands, ook als de gebruiker in het Engels schrijft.
-            """
-            
             # Create a message with the Claude client using Messages API
-            # Note: with newer versions of Anthropic client, this is not an async method
-            response = self.client.messages.create(
+            response = await self._create_message(
                 model=self.model,
-                max_tokens=1000,
-                system=system_prompt,
+                max_tokens=self.CHAT_MAX_TOKENS,
+                system=CHAT_SYSTEM_PROMPT,
                 messages=[
                     {"role": "user", "content": message}
                 ]
             )
             
-            return response.content[0].text
+            reply = response.content[0].text
+            self._chat_cache.put(cache_key, reply)
+            return reply
             
         except Exception as e:
             logger.error(f"Error generating response: {e}")
-            return "Sorry, I'm having trouble generating a response right now. Please try again."
\ No newline at end of file
+            return "Sorry, I'm having trouble generating a response right now. Please try again."
+
+@functools.cache
+def get_claude_client() -> ClaudeClient:
+    """
+    Get the shared Claude client, creating it on first use.
+    
+    Returns:
+        The process-wide ClaudeClient
+    """
+    return ClaudeClient()
@@ -2,11 +2,32 @@
 
 import os
 import json
-from typing import Dict, Optional, List, Tuple
+import functools
+from typing import Dict, Iterable, Mapping, Optional, List, Set, Tuple
 from pathlib import Path
+from types import MappingProxyType
 import re
 from loguru import logger
 
+from utils.json_utils import dump_json
+
+# Patterns used when normalizing names and codes, compiled once
+NON_ALPHANUMERIC_RE = re.compile(r'[^a-z0-9]')
+NON_LETTER_RE = re.compile(r'[^A-Z]')
+WORD_RE = re.compile(r'\b\w+\b')
+
+def trigrams(name: str) -> Set[str]:
+    """
+    Get all 3-character substrings of a normalized name.
+    
+    Args:
+        name: The normalized client name
+        
+    Returns:
+        Set of trigrams, empty for names shorter than 3 characters
+    """
+    return {name[i:i + 3] for i in range(len(name) - 2)}
+
 class ClientMapper:
     """Maps client names to their 3-letter codes."""
     
@@ -19,6 +40,18 @@ class ClientMapper:
         """
         self.config_file = config_file
         self.client_codes = {}
+        
+        # Bumped on every change so callers can cache data derived from the mappings
+        self.version = 0
+        
+        # Trigram -> names containing it, so substring lookups only check likely
+        # candidates; rebuilt lazily when the mappings change
+        self._trigram_index: Dict[str, Set[str]] = {}
+        self._short_names: List[str] = []  # names too short to be indexed
+        self._name_positions: Dict[str, int] = {}  # name -> insertion order
+        self._indexed_codes = None
+        self._indexed_version = -1
+        
         self._load_mappings()
     
     def _load_mappings(self) -> None:
@@ -31,7 +64,7 @@ class ClientMapper:
             
             # If the file exists, load it
             if config_path.exists():
-                with open(config_path, 'r') as f:
+                with open(config_path, 'rb') as f:
                     self.client_codes = json.load(f)
                 logger.info(f"Loaded {len(self.client_codes)} client codes from {self.config_file}")
             else:
@@ -48,15 +81,9 @@ class ClientMapper:
     def _save_mappings(self) -> None:
         """Save client-code mappings to the config file."""
         try:
-            config_path = Path(self.config_file)
-            
-            # Create directory if it doesn't exist
-            os.makedirs(config_path.parent, exist_ok=True)
-            
-            # Save mappings
-            with open(config_path, 'w') as f:
-                json.dump(self.client_codes, f, indent=2)
-            logger.info(f"Saved {len(self.client_codes)} client codes to {self.config_file}")
+            # The directory was created when the mappings were loaded
+            dump_json(self.config_file, self.client_codes)
+            logger.info("Saved {} client codes to {}", len(self.client_codes), self.config_file)
         except Exception as e:
             logger.error(f"Error saving client codes: {e}")
     
@@ -77,11 +104,20 @@ class ClientMapper:
         if normalized_name in self.client_codes:
             return self.client_codes[normalized_name]
         
-        # Look for partial match with any existing client name
-        for existing_name, code in self.client_codes.items():
+        # Look for partial match with any existing client name. Every candidate
+        # shares a trigram with the query, unless it is too short to have one.
+        if len(normalized_name) < 3:
+            candidates = self.client_codes
+        else:
+            self._ensure_index()
+            candidates = self._in_order(set(self._short_names).union(
+                *(self._trigram_index.get(trigram, ()) for trigram in trigrams(normalized_name))
+            ))
+        
+        for existing_name in candidates:
             if (normalized_name in existing_name or 
                 existing_name in normalized_name):
-                return code
+                return self.client_codes[existing_name]
         
         # No match found
         return None
@@ -100,20 +136,53 @@ class ClientMapper:
         
         # Add the mapping
         self.client_codes[normalized_name] = normalized_code
+        self.version += 1
         
         # Save to file
         self._save_mappings()
         
-        logger.info(f"Added client code mapping: {normalized_name} -> {normalized_code}")
+        logger.info("Added client code mapping: {} -> {}", normalized_name, normalized_code)
     
-    def get_all_mappings(self) -> Dict[str, str]:
+    def _ensure_index(self) -> None:
+        """Rebuild the trigram index if the mappings changed since it was built."""
+        if self._indexed_codes is self.client_codes and self._indexed_version == self.version:
+            return
+        
+        index: Dict[str, Set[str]] = {}
+        short_names = []
+        for name in self.client_codes:
+            if len(name) < 3:
+                short_names.append(name)
+            for trigram in trigrams(name):
+                index.setdefault(trigram, set()).add(name)
+        
+        self._trigram_index = index
+        self._short_names = short_names
+        self._name_positions = {name: i for i, name in enumerate(self.client_codes)}
+        self._indexed_codes = self.client_codes
+        self._indexed_version = self.version
+    
+    def _in_order(self, names: Iterable[str]) -> List[str]:
+        """
+        Sort candidate names in mapping order, so lookups return the same
+        match as a scan over all mappings would.
+        
+        Args:
+            names: Names from the index
+            
+        Returns:
+            The names in insertion order
+        """
+        return sorted(names, key=self._name_positions.__getitem__)
+    
+    def get_all_mappings(self) -> Mapping[str, str]:
         """
         Get all client-code mappings.
         
         Returns:
-            Dictionary of client names to codes
+            Read-only view of client names to codes
         """
-        return dict(self.client_codes)
+        return MappingProxyType(self.client_codes)
     
     def _normalize_client_name(self, client_name: str) -> str:
         """
@@ -138,7 +207,7 @@ class ClientMapper:
                 normalized = normalized[len(prefix):]
         
         # Remove non-alphanumeric characters
-        normalized = re.sub(r'[^a-z0-9]', '', normalized)
+        normalized = NON_ALPHANUMERIC_RE.sub('', normalized)
         
         return normalized
     
@@ -155,20 +224,8 @@ class ClientMapper:
         if not code:
             return ""
         
-        # Convert to uppercase
-        normalized = code.upper()
-        
-        # Keep only letters
-        normalized = re.sub(r'[^A-Z]', '', normalized)
-        
-        # Ensure it's exactly 3 letters
-        if len(normalized) > 3:
-            normalized = normalized[:3]
-        elif len(normalized) < 3:
-            # Pad with 'X' if shorter than 3 letters
-            normalized = normalized + 'X' * (3 - len(normalized))
-        
-        return normalized
+        # Keep only letters, then truncate or pad with 'X' to exactly 3 letters
+        return NON_LETTER_RE.sub('', code.upper())[:3].ljust(3, 'X')
     
     def suggest_code_for_client(self, client_name: str) -> str:
         """
@@ -184,7 +241,7 @@ class ClientMapper:
             return "UNK"  # Unknown
         
         # Split into words
-        words = re.findall(r'\b\w+\b', client_name.upper())
+        words = WORD_RE.findall(client_name.upper())
         
         if not words:
             return "UNK"
@@ -221,12 +278,30 @@ class ClientMapper:
         
         normalized_partial = self._normalize_client_name(partial_name)
         
+        # Clients containing the partial name contain all of its trigrams
+        if len(normalized_partial) < 3:
+            candidates = self.client_codes
+        else:
+            self._ensure_index()
+            postings = [self._trigram_index.get(trigram, set()) for trigram in trigrams(normalized_partial)]
+            candidates = self._in_order(set.intersection(*postings))
+        
         # Find all clients that contain the partial name
         matching_clients = []
-        for client_name, code in self.client_codes.items():
+        for client_name in candidates:
             if normalized_partial in client_name:
                 # Find the original client name (before normalization)
                 # This is a workaround since we don't store the original names
-                matching_clients.append((client_name, code))
+                matching_clients.append((client_name, self.client_codes[client_name]))
         
-        return matching_clients
\ No newline at end of file
+        return matching_clients
+
+@functools.cache
+def get_client_mapper() -> ClientMapper:
+    """
+    Get the shared client mapper, loading the mappings on first use.
+    
+    Returns:
+        The process-wide ClientMapper
+    """
+    return ClientMapper()
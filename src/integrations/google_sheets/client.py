@@ -2,8 +2,13 @@
 
 import os
 import json
+import time
 import pickle
-from typing import Dict, Any, List
+import functools
+import itertools
+import operator
+import threading
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 from loguru import logger
@@ -14,6 +19,136 @@ from google.oauth2.credentials import Credentials
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 
+try:
+    from utils.json_utils import dump_json
+except ImportError:  # Scripts in the repository root import this module through the src package
+    from src.utils.json_utils import dump_json
+
+# Sheet titles and headers from the last startup, so a restart within the TTL
+# skips the metadata and header requests
+SHEET_STRUCTURE_CACHE_FILE = "config/sheet_structure.json"
+SHEET_STRUCTURE_CACHE_TTL = 60 * 60
+
+# Sheets with more grid rows than this get their date column read first for a
+# date-filtered read, so only matching rows are downloaded; smaller sheets are
+# cheaper to read whole in a single request (new sheets start with 1000 rows)
+DATE_PROBE_MIN_ROWS = 2000
+
+# Default column mapping (expected structure)
+# 0 = Date, 1 = Client, 2 = Description, 3 = Hours, 4 = Unbillable hours, 5 = Revenue
+DEFAULT_COLUMN_MAPPING = {
+    'date': 0,
+    'client': 1,
+    'description': 2,
+    'hours': 3,
+    'unbillable_hours': 4,
+    'revenue': 5
+}
+
+# Column keys and how to recognize their header: (key, any of, all of, none of).
+# The first rule that matches a header wins.
+COLUMN_RULES = (
+    ('date', ('datum', 'date'), (), ()),
+    ('client', ('klant', 'client'), (), ()),
+    ('description', ('beschrijving', 'description'), (), ()),
+    ('hours', ('uren',), (), ('onbetaald', 'unbillable')),
+    ('unbillable_hours', ('onbetaald', 'unbillable'), ('uren',), ()),
+    ('revenue', ('omzet', 'revenue'), (), ()),
+)
+
+# Header row used for a new test sheet when the work sheet has none
+DEFAULT_HEADERS = ['Datum', 'Klant', 'Beschrijving', 'Uren', 'Uren onbetaald', 'Omzet']
+
+# Dutch sheet headers and the English keys used in work entry dictionaries
+HEADER_MAPPING = {
+    'Datum': 'Date',
+    'Klant': 'Client',
+    'Beschrijving': 'Description',
+    'Uren': 'Hours',
+    'Uren onbetaald': 'Unbillable Hours',
+    'Omzet': 'Revenue'
+}
+
+# The Sheets service and its HTTP connection are shared between clients and are
+# not thread-safe, so methods that call the API hold this lock.
+_service_lock = threading.RLock()
+
+def _with_service_lock(method):
+    """Run a client method while holding the shared service lock."""
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with _service_lock:
+            return method(*args, **kwargs)
+    return wrapper
+
+@functools.lru_cache(maxsize=4)
+def _cached_service_account_credentials(
+    path: str, mtime_ns: int, size: int, scopes: Tuple[str, ...]
+) -> service_account.Credentials:
+    """Build service account credentials for a specific version of a key file."""
+    with open(path, 'rb') as f:
+        info = json.load(f)
+    return service_account.Credentials.from_service_account_info(info, scopes=list(scopes))
+
+def load_service_account_credentials(path: str, scopes: List[str]) -> service_account.Credentials:
+    """
+    Load service account credentials, reusing them while the key file is unchanged.
+    
+    The cache is keyed by the file's modification time and size, so parsing the
+    key and constructing the RSA signer only happens again after the file changes.
+    
+    Args:
+        path: Path to the service account JSON key file
+        scopes: OAuth scopes to request
+        
+    Returns:
+        Service account credentials
+    """
+    stat = os.stat(path)
+    return _cached_service_account_credentials(
+        path, stat.st_mtime_ns, stat.st_size, tuple(scopes)
+    )
+
+@functools.lru_cache(maxsize=1)
+def get_sheets_service(credentials):
+    """
+    Get a Sheets API service for the given credentials.
+    
+    The service is shared between clients that use the same credentials object,
+    so its HTTP connection is kept alive and reused instead of being rebuilt
+    for every client.
+    
+    Args:
+        credentials: Google credentials to authorize requests with
+        
+    Returns:
+        A Sheets API v4 service resource
+    """
+    return build('sheets', 'v4', credentials=credentials)
+
+@functools.lru_cache(maxsize=8)
+def map_headers(headers: Tuple[str, ...]) -> Dict[str, int]:
+    """
+    Map sheet headers to column indexes, starting from the default layout.
+    
+    Args:
+        headers: The header row of the work hours sheet
+        
+    Returns:
+        Dictionary of column keys to 0-based column indexes; shared between
+        callers, so it must not be modified
+    """
+    mapping = dict(DEFAULT_COLUMN_MAPPING)
+    for i, header in enumerate(headers):
+        header_lower = header.lower()
+        for key, any_of, all_of, none_of in COLUMN_RULES:
+            if (any(token in header_lower for token in any_of)
+                    and all(token in header_lower for token in all_of)
+                    and not any(token in header_lower for token in none_of)):
+                mapping[key] = i
+                break
+    return mapping
+
 class GoogleSheetsClient:
     """Client for interacting with the Google Sheets API."""
     
@@ -35,6 +170,12 @@ class GoogleSheetsClient:
         self.test_sheet = f"Test-{self.current_year}"
         self.work_hours_sheet = self.current_year
         
+        # Sheet title -> numeric sheet ID, needed to insert rows
+        self.sheet_ids: Dict[str, int] = {}
+        
+        # Sheet title -> number of grid rows when the structure was detected
+        self.sheet_row_counts: Dict[str, int] = {}
+        
         # Attempt to detect existing sheet structure
         self._detect_sheet_structure()
         
@@ -48,7 +189,7 @@ class GoogleSheetsClient:
             
             # Check if we have a token file
             if os.path.exists(self.token_file):
-                with open(self.token_file, 'r') as token:
+                with open(self.token_file, 'rb') as token:
                     try:
                         creds_data = json.load(token)
                         
@@ -62,9 +203,8 @@ class GoogleSheetsClient:
                                 logger.error(f"Service account file not found at {service_account_file}")
                                 raise ValueError(f"Service account file not found at {service_account_file}")
                             
-                            from google.oauth2 import service_account
-                            credentials = service_account.Credentials.from_service_account_file(
-                                service_account_file, scopes=scopes
+                            credentials = load_service_account_credentials(
+                                service_account_file, scopes
                             )
                             logger.info("Successfully loaded service account credentials")
                         else:
@@ -81,20 +221,21 @@ class GoogleSheetsClient:
                 if credentials.expired and credentials.refresh_token:
                     credentials.refresh(Request())
                     logger.info("OAuth credentials refreshed")
+                    self._save_oauth_token(credentials)
                 else:
                     logger.error("Invalid credentials and can't refresh")
             
             # If no credentials, try service account file directly
             if not credentials and os.path.exists(self.credentials_file):
-                with open(self.credentials_file, 'r') as f:
+                with open(self.credentials_file, 'rb') as f:
                     try:
                         creds_data = json.load(f)
                         logger.info(f"Trying service account at {self.credentials_file}")
                         
                         # If this is a service account credentials file
                         if creds_data.get('type') == 'service_account':
-                            credentials = service_account.Credentials.from_service_account_file(
-                                self.credentials_file, scopes=scopes
+                            credentials = load_service_account_credentials(
+                                self.credentials_file, scopes
                             )
                             logger.info("Switched to service account authentication")
                         else:
@@ -108,37 +249,116 @@ class GoogleSheetsClient:
                 raise ValueError("Authentication required")
             
             # Create the Sheets API service
-            self.sheets = build('sheets', 'v4', credentials=credentials)
+            self.sheets = get_sheets_service(credentials)
             logger.info("Google Sheets client initialized successfully")
             
         except Exception as e:
             logger.error(f"Error setting up Google Sheets client: {e}")
             raise
     
+    def _save_oauth_token(self, credentials: Credentials) -> None:
+        """
+        Store refreshed OAuth credentials, so a restart within the access token's
+        lifetime doesn't need to refresh it again.
+        
+        Args:
+            credentials: The refreshed OAuth credentials
+        """
+        try:
+            dump_json(self.token_file, json.loads(credentials.to_json()))
+        except Exception as e:
+            logger.warning(f"Error saving refreshed OAuth token: {e}")
+    
+    def _load_structure_cache(self) -> Optional[Dict[str, Any]]:
+        """
+        Load the cached sheet structure if it is recent and for this spreadsheet.
+        
+        Returns:
+            Dictionary with the sheet IDs by title and the headers, or None
+        """
+        try:
+            path = Path(SHEET_STRUCTURE_CACHE_FILE)
+            if time.time() - path.stat().st_mtime >= SHEET_STRUCTURE_CACHE_TTL:
+                return None
+            with open(path, 'rb') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if cached.get("spreadsheet_id") != self.spreadsheet_id:
+            return None
+        return cached
+    
+    def _save_structure_cache(self, headers: List[str]) -> None:
+        """
+        Save the detected sheet structure for the next startup.
+        
+        Args:
+            headers: Header row of the work hours sheet
+        """
+        try:
+            os.makedirs(Path(SHEET_STRUCTURE_CACHE_FILE).parent, exist_ok=True)
+            dump_json(SHEET_STRUCTURE_CACHE_FILE, {
+                "spreadsheet_id": self.spreadsheet_id,
+                "sheet_ids": self.sheet_ids,
+                "row_counts": self.sheet_row_counts,
+                "headers": headers
+            })
+        except Exception as e:
+            logger.warning(f"Error saving sheet structure cache: {e}")
+    
     def _detect_sheet_structure(self):
         """Detect existing sheets and column structure."""
         try:
-            # Get all sheet names
+            # Reuse the structure found by a recent startup if both sheets existed then
+            cached = self._load_structure_cache()
+            if cached and {self.work_hours_sheet, self.test_sheet} <= set(cached.get("sheet_ids", {})):
+                logger.info("Using cached sheet structure")
+                self.sheet_ids = cached["sheet_ids"]
+                self.sheet_row_counts = cached.get("row_counts", {})
+                self._detect_columns(cached.get("headers", []))
+                return
+            
+            # Get all sheet names and the work sheet's header row in one request
+            metadata_found = True
             try:
                 sheet_metadata = self.sheets.spreadsheets().get(
-                    spreadsheetId=self.spreadsheet_id
+                    spreadsheetId=self.spreadsheet_id,
+                    ranges=[f"{self.work_hours_sheet}!1:1"],
+                    includeGridData=True,
+                    fields="sheets(properties(title,sheetId,gridProperties.rowCount),data.rowData.values.formattedValue)"
                 ).execute()
             except Exception as e:
-                logger.error(f"Error getting spreadsheet metadata: {e}")
-                sheet_metadata = {"sheets": []}
+                # The range is rejected when the work sheet doesn't exist yet
+                logger.warning(f"Error getting spreadsheet metadata with headers: {e}")
+                try:
+                    sheet_metadata = self.sheets.spreadsheets().get(
+                        spreadsheetId=self.spreadsheet_id,
+                        fields="sheets.properties(title,sheetId,gridProperties.rowCount)"
+                    ).execute()
+                except Exception as e:
+                    logger.error(f"Error getting spreadsheet metadata: {e}")
+                    sheet_metadata = {"sheets": []}
+                    metadata_found = False
             
-            sheets = [sheet['properties']['title'] for sheet in sheet_metadata.get('sheets', [])]
-            logger.info(f"Found sheets: {sheets}")
+            headers = []
+            for sheet in sheet_metadata.get('sheets', []):
+                title = sheet['properties']['title']
+                self.sheet_ids[title] = sheet['properties'].get('sheetId', 0)
+                self.sheet_row_counts[title] = sheet['properties'].get('gridProperties', {}).get('rowCount', 0)
+                if title == self.work_hours_sheet:
+                    headers = self._headers_from_grid_data(sheet)
+            logger.info(f"Found sheets: {list(self.sheet_ids)}")
             
             # Ensure the needed sheets exist
-            if self.work_hours_sheet not in sheets:
+            if self.work_hours_sheet not in self.sheet_ids:
                 logger.warning(f"Sheet '{self.work_hours_sheet}' not found. Will create it if needed.")
             
             # Create test sheet if it doesn't exist
-            if self.test_sheet not in sheets:
+            if self.test_sheet not in self.sheet_ids:
                 logger.info(f"Creating test sheet '{self.test_sheet}'")
                 try:
-                    self.sheets.spreadsheets().batchUpdate(
+                    reply = self.sheets.spreadsheets().batchUpdate(
                         spreadsheetId=self.spreadsheet_id,
                         body={
                             "requests": [
@@ -152,95 +372,89 @@ class GoogleSheetsClient:
                             ]
                         }
                     ).execute()
+                    self.sheet_ids[self.test_sheet] = reply['replies'][0]['addSheet']['properties']['sheetId']
                 except Exception as e:
                     logger.error(f"Error creating test sheet: {e}")
                 
                 # Copy headers from work sheet if it exists
-                if self.work_hours_sheet in sheets:
-                    # Get headers from work sheet
-                    try:
-                        result = self.sheets.spreadsheets().values().get(
-                            spreadsheetId=self.spreadsheet_id,
-                            range=f"{self.work_hours_sheet}!A1:G1"
-                        ).execute()
-                    except Exception as e:
-                        logger.error(f"Error getting headers from work sheet: {e}")
-                        result = {"values": [['Datum', 'Klant', 'Beschrijving', 'Uren', 'Uren onbetaald', 'Omzet']]}
-                    
-                    headers = result.get('values', [['Datum', 'Klant', 'Beschrijving', 'Uren', 'Uren onbetaald', 'Omzet']])
-                    
-                    # Copy headers to test sheet
+                if self.work_hours_sheet in self.sheet_ids:
                     try:
                         self.sheets.spreadsheets().values().update(
                             spreadsheetId=self.spreadsheet_id,
                             range=f"{self.test_sheet}!A1:G1",
                             valueInputOption="RAW",
                             body={
-                                "values": headers
+                                "values": [headers[:7] or DEFAULT_HEADERS]
                             }
                         ).execute()
                     except Exception as e:
                         logger.error(f"Error copying headers to test sheet: {e}")
             
-            # Detect column structure
-            self._detect_columns()
+            # Detect column structure from the headers fetched above
+            if metadata_found:
+                self._detect_columns(headers)
+                self._save_structure_cache(headers)
+            else:
+                self._detect_columns()
             
         except Exception as e:
             logger.error(f"Error detecting sheet structure: {e}")
     
-    def _detect_columns(self):
-        """Detect column mapping in the work hours sheet."""
+    @staticmethod
+    def _headers_from_grid_data(sheet: Dict[str, Any]) -> List[str]:
+        """
+        Get the header row from a sheet in a spreadsheets.get grid data response.
+        
+        Args:
+            sheet: One entry of the response's "sheets" list
+            
+        Returns:
+            The formatted header values, empty if the row is empty
+        """
+        data = sheet.get('data') or [{}]
+        rows = data[0].get('rowData') or [{}]
+        return [cell.get('formattedValue', '') for cell in rows[0].get('values', [])]
+    
+    def _detect_columns(self, headers: Optional[List[str]] = None) -> Optional[List[str]]:
+        """
+        Detect column mapping in the work hours sheet.
+        
+        Args:
+            headers: Known header row, fetched from the sheet if not given
+            
+        Returns:
+            The header row, or None if it couldn't be read
+        """
         try:
             # Try to get headers from the current year sheet
-            try:
-                result = self.sheets.spreadsheets().values().get(
-                    spreadsheetId=self.spreadsheet_id,
-                    range=f"{self.work_hours_sheet}!1:1"
-                ).execute()
-            except Exception as e:
-                logger.error(f"Error getting headers: {e}")
-                return
+            if headers is None:
+                try:
+                    result = self.sheets.spreadsheets().values().get(
+                        spreadsheetId=self.spreadsheet_id,
+                        range=f"{self.work_hours_sheet}!1:1"
+                    ).execute()
+                except Exception as e:
+                    logger.error(f"Error getting headers: {e}")
+                    return None
+                
+                values = result.get('values', [])
+                headers = values[0] if values else []
             
-            values = result.get('values', [])
-            if not values:
+            if not headers:
                 logger.warning(f"No headers found in sheet {self.work_hours_sheet}")
-                return
+                return headers
             
-            headers = values[0]
             logger.info(f"Detected headers: {headers}")
             
-            # Default column mapping (expected structure)
-            # 0 = Date, 1 = Client, 2 = Description, 3 = Hours, 4 = Unbillable hours, 5 = Revenue
-            self.column_mapping = {
-                'date': 0,
-                'client': 1,
-                'description': 2,
-                'hours': 3,
-                'unbillable_hours': 4,
-                'revenue': 5
-            }
-            
-            # Try to map headers
-            for i, header in enumerate(headers):
-                header_lower = header.lower()
-                
-                if 'datum' in header_lower or 'date' in header_lower:
-                    self.column_mapping['date'] = i
-                elif 'klant' in header_lower or 'client' in header_lower:
-                    self.column_mapping['client'] = i
-                elif 'beschrijving' in header_lower or 'description' in header_lower:
-                    self.column_mapping['description'] = i
-                elif 'uren' in header_lower and 'onbetaald' not in header_lower and 'unbillable' not in header_lower:
-                    self.column_mapping['hours'] = i
-                elif ('onbetaald' in header_lower or 'unbillable' in header_lower) and 'uren' in header_lower:
-                    self.column_mapping['unbillable_hours'] = i
-                elif 'omzet' in header_lower or 'revenue' in header_lower:
-                    self.column_mapping['revenue'] = i
+            # Try to map headers; the mapping is shared, so keep a copy we may change
+            self._set_column_mapping(dict(map_headers(tuple(headers))))
             
             logger.info(f"Column mapping: {self.column_mapping}")
+            return headers
             
         except Exception as e:
             logger.error(f"Error detecting columns: {e}")
+            return None
     
     def add_work_entry(self, work_data: Dict[str, Any], test_mode: bool = True) -> bool:
         """
@@ -253,72 +467,122 @@ class GoogleSheetsClient:
         Returns:
             True if successful, False otherwise
         """
-        try:
-            # Determine target sheet
-            target_sheet = self.test_sheet if test_mode else self.work_hours_sheet
-            
-            # Format the row data
-            formatted_row = self._format_row_data(work_data)
-            
-            # Get the date from work_data
-            date_str = work_data.get("date", datetime.now().strftime("%d-%m-%Y"))
-            client_str = work_data.get("client", "")
+        return self.add_work_entries([(work_data, test_mode)])
+    
+    @_with_service_lock
+    def add_work_entries(self, entries: List[Tuple[Dict[str, Any], bool]]) -> bool:
+        """
+        Add several work entries to the spreadsheet with as few writes as possible.
+        
+        Entries for a client that already has a row on their date update that
+        row. Other entries under an existing date row get a new row at the end of
+        the date's group; those rows are inserted first, so nothing below them is
+        overwritten. The rest are appended with one append call per sheet.
+        
+        Args:
+            entries: List of (work_data, test_mode) tuples
             
-            # Try to find a row with matching date and empty client
-            date_row = self._find_date_row(target_sheet, date_str)
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            # (sheet, date, client) -> (sheet, row, index among new rows or None for an
+            # existing row); a later entry for the same client and date replaces the earlier
+            # one, as when the entries are written one at a time
+            positions: Dict[Tuple[str, Any, Any], Tuple[str, int, Optional[int]]] = {}
+            rows: Dict[Tuple[str, Any, Any], list] = {}
+            # Sheet -> row new rows are inserted before -> number of new rows
+            inserted_rows: Dict[str, Dict[int, int]] = {}
+            appended_rows: Dict[str, List[list]] = {}
             
-            # If using existing template with dates
-            if date_row > 0:
-                logger.info(f"Found existing date row at {date_row} for date {date_str}")
+            for work_data, test_mode in entries:
+                # Determine target sheet
+                target_sheet = self.test_sheet if test_mode else self.work_hours_sheet
                 
-                # Check if there's already an entry for this client on this date
-                client_row = self._find_client_row(target_sheet, date_str, client_str)
+                # Format the row data
+                formatted_row = self._format_row_data(work_data)
                 
-                if client_row > 0:
-                    # Update the existing row for this client
-                    logger.info(f"Updating existing row {client_row} for client {client_str}")
-                    row_to_update = client_row
+                # Rows found for earlier entries in this batch aren't in the sheet yet
+                key = (target_sheet, work_data.get("date"), work_data.get("client"))
+                if key in positions:
+                    rows[key] = formatted_row
+                    continue
+                
+                # Without a date row the entry goes after the last row, which Sheets finds itself
+                row_to_update, is_new_row = self._find_row_for_entry(target_sheet, work_data)
+                if row_to_update is None or (is_new_row and target_sheet not in self.sheet_ids):
+                    appended_rows.setdefault(target_sheet, []).append(formatted_row)
+                    continue
+                
+                if is_new_row:
+                    counts = inserted_rows.setdefault(target_sheet, {})
+                    positions[key] = (target_sheet, row_to_update, counts.get(row_to_update, 0))
+                    counts[row_to_update] = counts.get(row_to_update, 0) + 1
                 else:
-                    # Create a new row below the date row or below the last client for this date
-                    logger.info(f"Adding new row for client {client_str} on date {date_str}")
-                    row_to_update = self._insert_row_after(target_sheet, date_row)
-                    
-                    # Copy the date to the new row
-                    self.sheets.spreadsheets().values().update(
+                    positions[key] = (target_sheet, row_to_update, None)
+                rows[key] = formatted_row
+            
+            # Insert the new rows bottom-up, so each insert leaves the rows above it in place
+            insert_requests = [
+                {
+                    "insertDimension": {
+                        "range": {
+                            "sheetId": self.sheet_ids[target_sheet],
+                            "dimension": "ROWS",
+                            "startIndex": row - 1,
+                            "endIndex": row - 1 + count
+                        },
+                        "inheritFromBefore": True
+                    }
+                }
+                for target_sheet, counts in inserted_rows.items()
+                for row, count in sorted(counts.items(), reverse=True)
+            ]
+            
+            # Work out where each row ends up once the new rows are inserted
+            data: Dict[str, List[list]] = {}
+            for key, (target_sheet, row, new_index) in positions.items():
+                counts = inserted_rows.get(target_sheet, {})
+                if new_index is None:
+                    final_row = row + sum(count for before, count in counts.items() if before <= row)
+                else:
+                    final_row = row + sum(count for before, count in counts.items() if before < row) + new_index
+                
+                # Get column letters for our range
+                start_col = 'A'
+                end_col = chr(65 + len(rows[key]) - 1)
+                data[f"{target_sheet}!{start_col}{final_row}:{end_col}{final_row}"] = [rows[key]]
+            
+            try:
+                if insert_requests:
+                    self.sheets.spreadsheets().batchUpdate(
                         spreadsheetId=self.spreadsheet_id,
-                        range=f"{target_sheet}!{self._column_letter(self.column_mapping['date'])}{row_to_update}",
-                        valueInputOption="USER_ENTERED",
-                        body={"values": [[date_str]]}
+                        body={"requests": insert_requests}
                     ).execute()
-            else:
-                # If no existing date row found, find the next empty row
-                try:
-                    result = self.sheets.spreadsheets().values().get(
+                
+                # Write all rows under date rows in one request
+                if data:
+                    self.sheets.spreadsheets().values().batchUpdate(
                         spreadsheetId=self.spreadsheet_id,
-                        range=f"{target_sheet}!A:A"
+                        body={
+                            "valueInputOption": "USER_ENTERED",
+                            "data": [{"range": cell_range, "values": values} for cell_range, values in data.items()]
+                        }
                     ).execute()
-                except Exception as e:
-                    logger.error(f"Error getting values for next row: {e}")
-                    result = {"values": []}
+                    logger.opt(lazy=True).info("Added {} work entries: {}", lambda: len(data), lambda: list(data))
                 
-                values = result.get('values', [])
-                row_to_update = len(values) + 1
-                logger.info(f"No matching date row found, using next empty row: {row_to_update}")
-            
-            # Update the row with our data
-            try:
-                # Get column letters for our range
-                start_col = 'A'
-                end_col = chr(65 + len(formatted_row) - 1)
-                
-                self.sheets.spreadsheets().values().update(
-                    spreadsheetId=self.spreadsheet_id,
-                    range=f"{target_sheet}!{start_col}{row_to_update}:{end_col}{row_to_update}",
-                    valueInputOption="USER_ENTERED",
-                    body={"values": [formatted_row]}
-                ).execute()
+                # Append the remaining rows, one request per sheet
+                for target_sheet, rows in appended_rows.items():
+                    end_col = chr(65 + len(rows[0]) - 1)
+                    self.sheets.spreadsheets().values().append(
+                        spreadsheetId=self.spreadsheet_id,
+                        range=f"{target_sheet}!A:{end_col}",
+                        valueInputOption="USER_ENTERED",
+                        insertDataOption="INSERT_ROWS",
+                        body={"values": rows}
+                    ).execute()
+                    logger.info("Appended {} work entries to {}", len(rows), target_sheet)
                 
-                logger.info(f"Added work entry for {client_str} to {target_sheet} row {row_to_update}")
                 return True
             except Exception as e:
                 logger.error(f"Error updating sheet with row data: {e}")
@@ -328,10 +592,61 @@ class GoogleSheetsClient:
             logger.error(f"Error adding work entry to Google Sheets: {e}")
             return False
     
+    def _find_row_for_entry(self, target_sheet: str, work_data: Dict[str, Any]) -> Tuple[Optional[int], bool]:
+        """
+        Find the 1-based row a work entry should be written to.
+        
+        Args:
+            target_sheet: The sheet the entry is written to
+            work_data: The work entry
+            
+        Returns:
+            Tuple of the row (None to append the entry) and whether it is a new
+            row below the date row rather than the client's existing row
+        """
+        # Get the date from work_data
+        date_str = work_data.get("date", datetime.now().strftime("%d-%m-%Y"))
+        client_str = work_data.get("client", "")
+        
+        # Try to find a row with matching date and empty client
+        date_row = self._find_date_row(target_sheet, date_str)
+        
+        # If using existing template with dates
+        if date_row > 0:
+            logger.info("Found existing date row at {} for date {}", date_row, date_str)
+            
+            # Check if there's already an entry for this client on this date
+            client_row = self._find_client_row(target_sheet, date_str, client_str)
+            
+            if client_row > 0:
+                # Update the existing row for this client
+                logger.info("Updating existing row {} for client {}", client_row, client_str)
+                return client_row, False
+            
+            # Create a new row below the date row or below the last client for this date
+            logger.info("Adding new row for client {} on date {}", client_str, date_str)
+            return self._insert_row_after(target_sheet, date_row), True
+        
+        # If no existing date row found, append after the last row
+        logger.info("No matching date row found for {}, appending", date_str)
+        return None, False
+    
+    def _set_column_mapping(self, column_mapping: Dict[str, int]) -> None:
+        """
+        Set the column mapping and the row layout derived from it.
+        
+        Args:
+            column_mapping: Dictionary of column keys to 0-based column indexes
+        """
+        self.column_mapping = column_mapping
+        # The timestamp goes in the first column after the mapped ones
+        self._timestamp_col = max(column_mapping.values()) + 1
+        self._row_width = self._timestamp_col + 1
+    
     def _format_row_data(self, work_data: Dict[str, Any]) -> list:
         """Format work data into a row for the spreadsheet."""
-        # Create a row with enough columns
-        row = [""] * (max(self.column_mapping.values()) + 2)  # +2 for possible timestamp column
+        # Create a row with enough columns, including the timestamp column
+        row = [""] * self._row_width
         
         # Add date
         row[self.column_mapping["date"]] = work_data.get("date", datetime.now().strftime("%d-%m-%Y"))
@@ -364,9 +679,8 @@ class GoogleSheetsClient:
         else:
             row[self.column_mapping["revenue"]] = ""
         
-        # Add timestamp if there's room
-        timestamp_col = max(self.column_mapping.values()) + 1
-        row[timestamp_col] = datetime.now().strftime("%d-%m-%Y %H:%M:%S")
+        # Add timestamp
+        row[self._timestamp_col] = datetime.now().strftime("%d-%m-%Y %H:%M:%S")
         
         return row
     
@@ -536,6 +850,7 @@ class GoogleSheetsClient:
             logger.error(f"Error determining insert row: {e}")
             return row_index + 1  # Just use the next row
     
+    @_with_service_lock
     def get_work_entries(self, start_date: str = None, end_date: str = None, include_test: bool = True) -> List[Dict[str, Any]]:
         """
         Get work entries from the spreadsheet, optionally filtered by date range.
@@ -549,7 +864,7 @@ class GoogleSheetsClient:
             List of work entry dictionaries
         """
         try:
-            entries = []
+            dated_entries = []  # (date, entry) pairs
             
             # Convert start_date and end_date to datetime objects for comparison
             start_dt = None
@@ -558,7 +873,7 @@ class GoogleSheetsClient:
                 try:
                     start_year, start_month, start_day = start_date.split('-')
                     start_dt = datetime(int(start_year), int(start_month), int(start_day))
-                    logger.info(f"Filtering entries from {start_dt.strftime('%d-%m-%Y')}")
+                    logger.opt(lazy=True).info("Filtering entries from {}", lambda: start_dt.strftime('%d-%m-%Y'))
                 except Exception as e:
                     logger.error(f"Error parsing start date {start_date}: {e}")
             
@@ -566,7 +881,7 @@ class GoogleSheetsClient:
                 try:
                     end_year, end_month, end_day = end_date.split('-')
                     end_dt = datetime(int(end_year), int(end_month), int(end_day), 23, 59, 59)
-                    logger.info(f"Filtering entries until {end_dt.strftime('%d-%m-%Y')}")
+                    logger.opt(lazy=True).info("Filtering entries until {}", lambda: end_dt.strftime('%d-%m-%Y'))
                 except Exception as e:
                     logger.error(f"Error parsing end date {end_date}: {e}")
             
@@ -575,44 +890,26 @@ class GoogleSheetsClient:
             if include_test:
                 sheets_to_check.append(self.test_sheet)
                 
-            logger.info(f"Checking sheets: {sheets_to_check}")
+            logger.info("Checking sheets: {}", sheets_to_check)
+            
+            # Get the header row and all rows that can match the date filter, for all sheets at once
+            sheet_rows = self._get_sheet_rows(sheets_to_check, start_dt, end_dt)
             
             # Process each sheet
-            for sheet_name in sheets_to_check:
+            for sheet_name, values in zip(sheets_to_check, sheet_rows):
                 try:
-                    # Get all data from the sheet
-                    try:
-                        result = self.sheets.spreadsheets().values().get(
-                            spreadsheetId=self.spreadsheet_id,
-                            range=f"{sheet_name}!A:G"
-                        ).execute()
-                        
-                        values = result.get('values', [])
-                    except Exception as e:
-                        logger.error(f"Error getting values from sheet {sheet_name}: {e}")
-                        values = []
-                    
                     if not values:
-                        logger.info(f"No data found in sheet {sheet_name}")
+                        logger.info("No data found in sheet {}", sheet_name)
                         continue
                     
                     # Extract headers and data
                     headers = values[0]
                     data_rows = values[1:]
                     
-                    logger.info(f"Found {len(data_rows)} rows in sheet {sheet_name}")
+                    logger.info("Found {} rows in sheet {}", len(data_rows), sheet_name)
                     
                     # Map the Dutch headers to English equivalents for consistency
-                    header_mapping = {
-                        'Datum': 'Date',
-                        'Klant': 'Client', 
-                        'Beschrijving': 'Description',
-                        'Uren': 'Hours',
-                        'Uren onbetaald': 'Unbillable Hours',
-                        'Omzet': 'Revenue'
-                    }
-                    
-                    mapped_headers = [header_mapping.get(h, h) for h in headers]
+                    mapped_headers = [HEADER_MAPPING.get(h, h) for h in headers]
                     
                     # Track how many rows pass the date filter
                     filtered_count = 0
@@ -623,11 +920,9 @@ class GoogleSheetsClient:
                         if not row or not ''.join(row).strip():
                             continue
                             
-                        # Pad row with empty strings if it's shorter than headers
-                        padded_row = row + [''] * (len(headers) - len(row))
-                        
-                        # Create entry with English header names
-                        entry = dict(zip(mapped_headers, padded_row))
+                        # Create entry with English header names, filling missing trailing cells
+                        # with empty strings without building a padded copy of the row
+                        entry = dict(zip(mapped_headers, itertools.chain(row, itertools.repeat(''))))
                         
                         # Add source sheet info
                         entry['Sheet'] = sheet_name
@@ -636,42 +931,200 @@ class GoogleSheetsClient:
                         should_include = True
                         
                         # Convert Dutch date to datetime for comparison
-                        if 'Date' in entry and entry['Date']:
-                            date_str = entry['Date']
-                            entry_dt = None
-                            
-                            try:
-                                if '-' in date_str:
-                                    # Handle DD-MM-YYYY format
-                                    day, month, year = date_str.split('-')
-                                    if len(year) == 4:  # Ensure it's a 4-digit year
-                                        entry_dt = datetime(int(year), int(month), int(day))
-                                    
-                                # Apply date filtering if we have a valid date
-                                if entry_dt:
-                                    if start_dt and entry_dt < start_dt:
-                                        should_include = False
-                                    if end_dt and entry_dt > end_dt:
-                                        should_include = False
-                            except Exception as e:
-                                logger.warning(f"Error parsing date '{date_str}': {e}")
+                        entry_dt = self._parse_sheet_date(entry['Date']) if entry.get('Date') else None
+                        
+                        # Apply date filtering if we have a valid date
+                        if entry_dt:
+                            if start_dt and entry_dt < start_dt:
+                                should_include = False
+                            if end_dt and entry_dt > end_dt:
+                                should_include = False
                         
-                        # Add entry if it passes the filter
+                        # Add entry if it passes the filter, keeping its date for sorting
                         if should_include:
-                            entries.append(entry)
+                            dated_entries.append((entry_dt or datetime.min, entry))
                             filtered_count += 1
                     
-                    logger.info(f"Included {filtered_count} entries from sheet {sheet_name} after date filtering")
+                    logger.info("Included {} entries from sheet {} after date filtering", filtered_count, sheet_name)
                         
                 except Exception as e:
                     logger.warning(f"Error processing sheet {sheet_name}: {e}")
                     continue
             
-            # Sort entries by date (most recent first)
-            entries.sort(key=lambda entry: entry.get('Date', ''), reverse=True)
+            # Sort entries by date (most recent first); undated entries go last
+            dated_entries.sort(key=operator.itemgetter(0), reverse=True)
             
-            return entries
+            return [entry for _, entry in dated_entries]
             
         except Exception as e:
             logger.error(f"Error getting work entries: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _parse_sheet_date(date_str: str) -> Optional[datetime]:
+        """
+        Parse a DD-MM-YYYY date cell.
+        
+        Results are cached because many rows share a date.
+        
+        Args:
+            date_str: The cell value
+            
+        Returns:
+            The date, or None if the cell isn't a DD-MM-YYYY date
+        """
+        try:
+            if '-' in date_str:
+                day, month, year = date_str.split('-')
+                if len(year) == 4:  # Ensure it's a 4-digit year
+                    return datetime(int(year), int(month), int(day))
+        except Exception as e:
+            logger.warning(f"Error parsing date '{date_str}': {e}")
+        return None
+    
+    def _matching_row_ranges(
+        self,
+        sheet_name: str,
+        dates: List[list],
+        start_dt: Optional[datetime],
+        end_dt: Optional[datetime]
+    ) -> List[str]:
+        """
+        Get the ranges of a sheet that can contain entries within the date filter.
+        
+        Args:
+            sheet_name: The sheet the dates were read from
+            dates: Values of the date column, starting with the header row
+            start_dt: Start of the date filter, or None
+            end_dt: End of the date filter, or None
+            
+        Returns:
+            A1 ranges to read, starting with the header row unless the whole sheet is needed
+        """
+        def excluded(cell: list, before_start: bool) -> bool:
+            entry_dt = self._parse_sheet_date(cell[0]) if cell else None
+            if entry_dt is None:
+                return False
+            return entry_dt < start_dt if before_start else entry_dt > end_dt
+        
+        # Skip leading rows dated before the start and trailing rows dated after the end
+        last_row = len(dates)
+        first_row = 2
+        if start_dt:
+            while first_row <= last_row and excluded(dates[first_row - 1], before_start=True):
+                first_row += 1
+        if end_dt:
+            while last_row >= first_row and excluded(dates[last_row - 1], before_start=False):
+                last_row -= 1
+        
+        if first_row == 2 and last_row == len(dates):
+            return [f"{sheet_name}!A:G"]
+        
+        ranges = [f"{sheet_name}!A1:G1"]
+        if last_row == len(dates):
+            ranges.append(f"{sheet_name}!A{first_row}:G")
+            return ranges
+        
+        if first_row <= last_row:
+            ranges.append(f"{sheet_name}!A{first_row}:G{last_row}")
+        # Rows below the last date may still hold undated entries
+        ranges.append(f"{sheet_name}!A{len(dates) + 1}:G")
+        return ranges
+    
+    def _get_sheet_rows(
+        self,
+        sheet_names: List[str],
+        start_dt: Optional[datetime] = None,
+        end_dt: Optional[datetime] = None
+    ) -> List[List[list]]:
+        """
+        Get the header row and data rows of several sheets, skipping leading
+        rows dated before start_dt and trailing rows dated after end_dt.
+        
+        All sheets are read with one batchGet request. With a date filter, the
+        date columns of large sheets are read first and their other columns are
+        fetched only for the rows that can still match. Rows without a
+        recognizable date are never skipped, so the result filters the same as
+        a full read.
+        
+        Args:
+            sheet_names: The sheets to read
+            start_dt: Start of the date filter, or None
+            end_dt: End of the date filter, or None
+            
+        Returns:
+            One list of rows per sheet, each starting with the header row
+        """
+        try:
+            return self._batch_get_sheet_rows(sheet_names, start_dt, end_dt)
+        except Exception as e:
+            if len(sheet_names) == 1:
+                logger.error(f"Error getting values from sheet {sheet_names[0]}: {e}")
+                return [[]]
+            
+            # One missing sheet fails the whole batch, so read the sheets separately
+            logger.warning(f"Error getting values from sheets {sheet_names}: {e}, reading them one by one")
+            return [self._get_sheet_rows([sheet_name], start_dt, end_dt)[0] for sheet_name in sheet_names]
+    
+    def _batch_get_sheet_rows(
+        self,
+        sheet_names: List[str],
+        start_dt: Optional[datetime],
+        end_dt: Optional[datetime]
+    ) -> List[List[list]]:
+        """
+        Read the rows of several sheets with batchGet, see _get_sheet_rows.
+        
+        Args:
+            sheet_names: The sheets to read
+            start_dt: Start of the date filter, or None
+            end_dt: End of the date filter, or None
+            
+        Returns:
+            One list of rows per sheet, each starting with the header row
+        """
+        values = self.sheets.spreadsheets().values()
+        sheet_ranges = [[f"{sheet_name}!A:G"] for sheet_name in sheet_names]
+        
+        # Probing the date column costs an extra round trip, which only pays off for large sheets
+        probed = [
+            i for i, sheet_name in enumerate(sheet_names)
+            if self.sheet_row_counts.get(sheet_name, 0) > DATE_PROBE_MIN_ROWS
+        ] if start_dt or end_dt else []
+        
+        if probed:
+            result = values.batchGet(
+                spreadsheetId=self.spreadsheet_id,
+                ranges=[f"{sheet_names[i]}!A:A" for i in probed]
+            ).execute()
+            
+            for i, date_range in zip(probed, result.get('valueRanges', [])):
+                sheet_ranges[i] = self._matching_row_ranges(
+                    sheet_names[i], date_range.get('values', []), start_dt, end_dt
+                )
+        
+        result = values.batchGet(
+            spreadsheetId=self.spreadsheet_id,
+            ranges=[sheet_range for ranges in sheet_ranges for sheet_range in ranges]
+        ).execute()
+        
+        # Value ranges come back in request order; stitch each sheet's ranges together
+        value_ranges = iter(result.get('valueRanges', []))
+        sheet_rows = []
+        for ranges in sheet_ranges:
+            rows = []
+            for _ in ranges:
+                rows.extend(next(value_ranges, {}).get('values', []))
+            sheet_rows.append(rows)
+        return sheet_rows
+
+@functools.cache
+def get_sheets_client() -> GoogleSheetsClient:
+    """
+    Get the shared Google Sheets client, creating it on first use.
+    
+    Returns:
+        The process-wide GoogleSheetsClient
+    """
+    return GoogleSheetsClient()
@@ -93,8 +93,11 @@ def format_work_summary(entries: List[Dict[str, Any]], period_type: str = None,
                 pass
     
     # Generate summary text
-    summary = f"{header}\n"
-    summary += f"*Totaal: {total_hours:.0f} | Declarabel: {billable_hours:.0f} | Niet-declarabel: {unbillable_hours:.0f}*\n\n"
+    # Collect the lines in a list and join once at the end
+    summary = [
+        f"{header}\n"
+        f"*Totaal: {total_hours:.0f} | Declarabel: {billable_hours:.0f} | Niet-declarabel: {unbillable_hours:.0f}*\n\n"
+    ]
     
     # Group entries by date and then by client
     date_client_entries = defaultdict(lambda: defaultdict(list))
@@ -141,11 +144,11 @@ def format_work_summary(entries: List[Dict[str, Any]], period_type: str = None,
                 # Keep original if parsing fails
                 pass
         
-        summary += f"📅 **{date_header}**\n"
+        summary.append(f"📅 **{date_header}**\n")
         
         # Sort clients by their code (alphabetically)
         for client in sorted(date_client_entries[date].keys()):
-            summary += f"- {client}\n"
+            summary.append(f"- {client}\n")
             
             # Group by description and sum hours
             description_hours = defaultdict(float)
@@ -164,10 +167,10 @@ def format_work_summary(entries: List[Dict[str, Any]], period_type: str = None,
             # Add each description with hours
             for description, hours in description_hours.items():
                 if hours > 0:
-                    summary += f"    - {description} ({hours:.0f}u)\n"
+                    summary.append(f"    - {description} ({hours:.0f}u)\n")
                 else:
-                    summary += f"    - {description}\n"
+                    summary.append(f"    - {description}\n")
         
-        summary += "\n"
+        summary.append("\n")
     
-    return summary.strip()
\ No newline at end of file
+    return "".join(summary).strip()
\ No newline at end of file
@@ -1,26 +1,40 @@
 """Bramify - Personal AI assistant for hour registration."""
 
 import os
+import sys
 import asyncio
 from dotenv import load_dotenv
 from loguru import logger
 
 from core.bot import BramifyBot
+from core.config import load_config
+
+try:
+    import uvloop
+except ImportError:  # uvloop is optional and not available on Windows
+    uvloop = None
 
 def main():
     """Initialize and run the Bramify application."""
     # Load environment variables
     load_dotenv()
     
-    # Configure logging
+    # Configure logging; variable dumps in tracebacks are only wanted when debugging
+    debug = load_config().debug
+    level = "DEBUG" if debug else "INFO"
     os.makedirs("logs", exist_ok=True)
-    logger.add("logs/bramify.log", rotation="10 MB", level="INFO")
+    logger.remove()
+    logger.add(sys.stderr, level=level, backtrace=debug, diagnose=debug, enqueue=True)
+    # Write the log file from a background thread so it never blocks the event loop
+    logger.add("logs/bramify.log", rotation="10 MB", level=level, backtrace=debug, diagnose=debug, enqueue=True)
     logger.info("Starting Bramify")
     
     # Initialize the bot
     bot = BramifyBot()
     
-    # Setup the event loop
+    # Setup the event loop, using libuv when available
+    if uvloop is not None:
+        uvloop.install()
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     
@@ -29,7 +43,7 @@ def main():
     
     # Let the application manage its own event loop
     # This works better with python-telegram-bot
-    bot.app.run_polling(close_loop=False)
+    bot.start(close_loop=False)
     
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -13,6 +13,9 @@ from loguru import logger
 from plugins.plugin_base import PluginBase
 from utils.date_utils import parse_date_text
 
+# "remind me ..." in any casing, used to detect and strip the request phrase
+REMIND_ME_RE = re.compile(r"remind\s+me\s+", re.IGNORECASE)
+
 class ReminderPlugin(PluginBase):
     """Plugin for setting and managing reminders."""
     
@@ -26,6 +29,28 @@ class ReminderPlugin(PluginBase):
         self.reminder_task = None
         self.storage_path = "config/reminders.json"
         
+        # Time expressions and their parsers, tried in order
+        self._time_patterns = [
+            (re.compile(pattern, re.IGNORECASE), parser)
+            for pattern, parser in (
+                # "in X hours/minutes/days"
+                (r"in\s+(\d+)\s+(hour|hours|hr|hrs)", self._parse_relative_time),
+                (r"in\s+(\d+)\s+(minute|minutes|min|mins)", self._parse_relative_time),
+                (r"in\s+(\d+)\s+(day|days)", self._parse_relative_time),
+                
+                # specific time "at X:XX"
+                (r"at\s+(\d{1,2}):(\d{2})(?:\s*(am|pm))?", self._parse_time),
+                (r"at\s+(\d{1,2})(?:\s*(am|pm))?", self._parse_time),
+                
+                # specific day "on Monday", "next Friday"
+                (r"(?:on|next)\s+(monday|tuesday|wednesday|thursday|friday|saturday|sunday)", self._parse_weekday),
+                
+                # tomorrow, day after tomorrow
+                (r"tomorrow", self._parse_tomorrow),
+                (r"day\s+after\s+tomorrow", self._parse_day_after_tomorrow),
+            )
+        ]
+        
         # Create config directory if it doesn't exist
         os.makedirs("config", exist_ok=True)
     
@@ -39,7 +64,7 @@ class ReminderPlugin(PluginBase):
         # Register message handler for natural language reminder setting
         self.register_message_handler(
             self.handle_reminder_message, 
-            filters.TEXT & filters.Regex(r"(?i)remind\s+me\s+")
+            filters.TEXT & filters.Regex(REMIND_ME_RE)
         )
         
         # Load existing reminders
@@ -54,7 +79,7 @@ class ReminderPlugin(PluginBase):
         """Load reminders from storage."""
         try:
             if os.path.exists(self.storage_path):
-                with open(self.storage_path, "r") as f:
+                with open(self.storage_path, "rb") as f:
                     stored_reminders = json.load(f)
                     
                     # Convert string keys (user_ids) back to integers
@@ -106,7 +131,7 @@ class ReminderPlugin(PluginBase):
         message = update.message.text
         
         # Check if it's a reminder message
-        if re.search(r"(?i)remind\s+me\s+", message):
+        if REMIND_ME_RE.search(message):
             # Process the reminder
             success, response = await self._process_reminder(update.effective_user.id, message)
             
@@ -123,31 +148,12 @@ class ReminderPlugin(PluginBase):
         Returns:
             Tuple of (success, response message)
         """
-        # Various time patterns to match
-        patterns = [
-            # "in X hours/minutes/days"
-            (r"in\s+(\d+)\s+(hour|hours|hr|hrs)", self._parse_relative_time),
-            (r"in\s+(\d+)\s+(minute|minutes|min|mins)", self._parse_relative_time),
-            (r"in\s+(\d+)\s+(day|days)", self._parse_relative_time),
-            
-            # specific time "at X:XX"
-            (r"at\s+(\d{1,2}):(\d{2})(?:\s*(am|pm))?", self._parse_time),
-            (r"at\s+(\d{1,2})(?:\s*(am|pm))?", self._parse_time),
-            
-            # specific day "on Monday", "next Friday"
-            (r"(?:on|next)\s+(monday|tuesday|wednesday|thursday|friday|saturday|sunday)", self._parse_weekday),
-            
-            # tomorrow, day after tomorrow
-            (r"tomorrow", self._parse_tomorrow),
-            (r"day\s+after\s+tomorrow", self._parse_day_after_tomorrow),
-        ]
-        
         reminder_time = None
         reminder_message = text
         
         # Try each pattern
-        for pattern, parser in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern, parser in self._time_patterns:
+            match = pattern.search(text)
             if match:
                 reminder_time = parser(match)
                 # Remove the time part from the message
@@ -171,7 +177,7 @@ class ReminderPlugin(PluginBase):
             return False, "I couldn't understand when to remind you. Please try again with a clearer time."
         
         # Clean up the message 
-        reminder_message = re.sub(r"(?i)remind\s+me\s+", "", reminder_message).strip()
+        reminder_message = REMIND_ME_RE.sub("", reminder_message).strip()
         
         if not reminder_message:
             return False, "Please specify what to remind you about."
@@ -299,7 +305,7 @@ class ReminderPlugin(PluginBase):
         reminders = self.reminders[user_id]
         now = datetime.now()
         
-        response = "📝 *Your Reminders:*\n\n"
+        parts = ["📝 *Your Reminders:*\n\n"]
         
         for i, reminder in enumerate(sorted(reminders, key=lambda r: r["time"])):
             reminder_time = datetime.fromtimestamp(reminder["time"])
@@ -314,10 +320,12 @@ class ReminderPlugin(PluginBase):
             else:
                 time_status = f"in {time_diff.seconds // 60} minutes"
                 
-            response += f"{i+1}. {reminder['message']}\n"
-            response += f"   📅 {reminder_time.strftime('%A, %B %d at %I:%M %p')} ({time_status})\n\n"
+            parts.append(
+                f"{i+1}. {reminder['message']}\n"
+                f"   📅 {reminder_time.strftime('%A, %B %d at %I:%M %p')} ({time_status})\n\n"
+            )
         
-        await update.message.reply_text(response, parse_mode="Markdown")
+        await update.message.reply_text("".join(parts), parse_mode="Markdown")
     
     async def cmd_clear_reminders(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /clear_reminders command to clear all reminders."""
@@ -1,5 +1,6 @@
 """Summary plugin for providing work summaries."""
 
+import asyncio
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from telegram import Update
@@ -75,8 +76,8 @@ class SummaryPlugin(PluginBase):
         start_date, end_date = get_date_range_for_period(period)
         logger.info(f"Generating work summary for period: {period} ({start_date} to {end_date})")
         
-        # Get work entries for the date range
-        entries = self.sheets.get_work_entries(start_date, end_date)
+        # Get work entries for the date range without blocking the event loop
+        entries = await asyncio.to_thread(self.sheets.get_work_entries, start_date, end_date)
         logger.info(f"Found {len(entries)} entries for period {period}")
         
         # Log informatie over testentries
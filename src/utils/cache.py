@@ -0,0 +1,74 @@
+"""In-memory caching helpers for Bramify."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize user text for use as a cache key.
+
+    Case and whitespace differences don't change what a message means, so
+    "4 uur  voor Acme" and "4 Uur voor acme" share a cache entry.
+
+    Args:
+        text: The text to normalize
+
+    Returns:
+        Lowercased text with runs of whitespace collapsed to single spaces
+    """
+    return " ".join(text.lower().split())
+
+class TTLCache:
+    """Least recently used cache whose entries also expire after a fixed time."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept
+            ttl: Seconds an entry stays valid after it was stored
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value), least recently used first
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            The cached value, or None if it is missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entries when full.
+
+        Args:
+            key: The cache key
+            value: The value to store
+        """
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        """Return the number of stored entries, including expired ones not yet evicted."""
+        return len(self._entries)
@@ -1,9 +1,40 @@
 """Date and time utilities for Bramify."""
 
 import re
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Optional, Tuple
 
+# Dutch relative date expressions and their offset in days from today
+DUTCH_RELATIVE_DAYS = {
+    "vandaag": 0,
+    "gisteren": -1,
+    "eergisteren": -2,
+    "morgen": 1,
+    "overmorgen": 2,
+    "vorige week": -7,
+    "volgende week": 7,
+}
+
+# Longest expressions first, so "eergisteren" isn't matched as "gisteren"
+DUTCH_RELATIVE_DATE_RE = re.compile(
+    r"\b(" + "|".join(sorted(DUTCH_RELATIVE_DAYS, key=len, reverse=True)) + r")\b",
+    re.IGNORECASE
+)
+
+# English weekday names, Monday first to match date.weekday()
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+# "last friday" and similar, pointing one week further back
+LAST_WEEKDAY_RE = re.compile(r"last\s+(" + "|".join(WEEKDAYS) + r")")
+
+# Dates in common formats
+ISO_DATE_RE = re.compile(r'(\d{4}-\d{2}-\d{2})')  # YYYY-MM-DD
+EUROPEAN_DATE_RE = re.compile(r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})')  # DD-MM-YYYY or DD/MM/YYYY
+SHORT_YEAR_DATE_RE = re.compile(r'(\d{1,2})[/-](\d{1,2})[/-](\d{2})')  # DD-MM-YY or DD/MM/YY
+
+# Explicit dates like 15-01, 15/01/2024 or 2024-01-15
+EXPLICIT_DATE_RE = re.compile(r"\d{1,4}[-/]\d{1,2}")
+
 def parse_date_text(text: str) -> Optional[str]:
     """
     Extract a date from natural language text.
@@ -30,40 +61,30 @@ def parse_date_text(text: str) -> Optional[str]:
         return (today + timedelta(days=1)).strftime("%Y-%m-%d")
     
     # Check for day of week
-    days = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
-    for i, day in enumerate(days):
+    for i, day in enumerate(WEEKDAYS):
         if day in text_lower:
             # Calculate the date of the most recent occurrence of this day
             today_weekday = today.weekday()
             days_diff = (today_weekday - i) % 7
             
             # If "last" appears before the day name, go back one more week
-            if re.search(r'last\s+' + day, text_lower):
+            if day in LAST_WEEKDAY_RE.findall(text_lower):
                 days_diff += 7
                 
             target_date = today - timedelta(days=days_diff)
             return target_date.strftime("%Y-%m-%d")
     
     # Check for dates in common formats
-    date_patterns = [
-        # ISO format: YYYY-MM-DD
-        r'(\d{4}-\d{2}-\d{2})',
-        # European format: DD-MM-YYYY or DD/MM/YYYY
-        r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})',
-        # Short year: DD-MM-YY or DD/MM/YY
-        r'(\d{1,2})[/-](\d{1,2})[/-](\d{2})'
-    ]
-    
-    for pattern in date_patterns:
-        match = re.search(pattern, text)
+    for pattern in (ISO_DATE_RE, EUROPEAN_DATE_RE, SHORT_YEAR_DATE_RE):
+        match = pattern.search(text)
         if match:
             try:
-                if pattern == date_patterns[0]:  # ISO format
+                if pattern is ISO_DATE_RE:
                     return match.group(1)
-                elif pattern == date_patterns[1]:  # European format
+                elif pattern is EUROPEAN_DATE_RE:
                     day, month, year = map(int, match.groups())
                     return f"{year}-{month:02d}-{day:02d}"
-                elif pattern == date_patterns[2]:  # Short year
+                elif pattern is SHORT_YEAR_DATE_RE:
                     day, month, year = map(int, match.groups())
                     # Assume 20xx for years less than 50, 19xx otherwise
                     year = 2000 + year if year < 50 else 1900 + year
@@ -75,6 +96,24 @@ def parse_date_text(text: str) -> Optional[str]:
     # No date found
     return None
 
+def resolve_dutch_relative_date(text: str, today: date) -> Optional[date]:
+    """
+    Resolve a Dutch relative date expression like "gisteren" in text.
+    
+    Args:
+        text: Natural language text, e.g. "2 uur voor Acme gisteren"
+        today: The date the expression is relative to
+        
+    Returns:
+        The resolved date, or None if the text has no relative date, has
+        several different ones, or also contains an explicit date
+    """
+    offsets = {DUTCH_RELATIVE_DAYS[match.lower()] for match in DUTCH_RELATIVE_DATE_RE.findall(text)}
+    if len(offsets) != 1 or EXPLICIT_DATE_RE.search(text):
+        return None
+    
+    return today + timedelta(days=offsets.pop())
+
 def get_date_range_for_period(period: str) -> Tuple[str, str]:
     """
     Get start and end dates for common time periods.
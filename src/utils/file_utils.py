@@ -0,0 +1,49 @@
+"""File system helpers for Bramify."""
+
+import os
+import fnmatch
+from pathlib import Path
+from typing import Optional, Union
+
+def find_latest_file(directory: Union[str, Path], pattern: str) -> Optional[Path]:
+    """
+    Find the most recently modified file in a directory matching a glob pattern.
+    
+    Uses a single os.scandir pass, so the modification time comes from the
+    directory entry instead of a separate stat call per match.
+    
+    Args:
+        directory: Directory to search (not recursive)
+        pattern: Glob pattern for the file name, e.g. "client_secret_*.json"
+        
+    Returns:
+        Path to the newest matching file, or None if there is none
+    """
+    latest = None
+    latest_mtime = None
+    
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not fnmatch.fnmatch(entry.name, pattern) or not entry.is_file():
+                    continue
+                
+                mtime = entry.stat().st_mtime
+                if latest_mtime is None or mtime > latest_mtime:
+                    latest, latest_mtime = entry.path, mtime
+    except FileNotFoundError:
+        return None
+    
+    return Path(latest) if latest else None
+
+def find_latest_client_secret(directory: Union[str, Path]) -> Optional[Path]:
+    """
+    Find the most recent OAuth client secret file in a directory.
+    
+    Args:
+        directory: Directory to search, usually the Downloads folder
+        
+    Returns:
+        Path to the newest client_secret_*.json file, or None if there is none
+    """
+    return find_latest_file(directory, "client_secret_*.json")
@@ -0,0 +1,69 @@
+"""JSON file helpers for Bramify."""
+
+import os
+import json
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib encoder
+    orjson = None
+
+PathLike = Union[str, Path]
+
+def loads_json(data: Union[bytes, str]) -> Any:
+    """
+    Parse a JSON document, using orjson when it is available.
+
+    Args:
+        data: The raw JSON document
+
+    Returns:
+        The parsed JSON value
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps_json(data: Any) -> bytes:
+    """
+    Serialize a value to indented JSON bytes, using orjson when it is available.
+
+    Args:
+        data: The value to serialize
+
+    Returns:
+        UTF-8 encoded JSON with a two-space indent
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+def load_json(path: PathLike) -> Any:
+    """
+    Read and parse a JSON file.
+
+    Args:
+        path: Path to the JSON file
+
+    Returns:
+        The parsed JSON value
+    """
+    return loads_json(Path(path).read_bytes())
+
+def dump_json(path: PathLike, data: Any) -> None:
+    """
+    Write a value to a JSON file.
+
+    The data goes to a temporary file that then replaces the target, so a crash
+    mid-write never leaves a truncated file behind.
+
+    Args:
+        path: Path to the JSON file
+        data: The value to serialize
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(dumps_json(data))
+    os.replace(tmp_path, path)
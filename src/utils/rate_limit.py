@@ -0,0 +1,44 @@
+"""Rate limiting helpers for Bramify."""
+
+import time
+import asyncio
+from collections import deque
+
+class RateLimiter:
+    """Async limiter that allows at most max_calls calls per sliding period."""
+
+    def __init__(self, max_calls: int, period: float):
+        """
+        Initialize the limiter.
+
+        Args:
+            max_calls: Maximum number of calls within one period
+            period: Length of the sliding window in seconds
+        """
+        self.max_calls = max_calls
+        self.period = period
+        self._calls = deque()  # start times of recent calls, oldest first
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until another call fits in the window, then record it."""
+        # Waiters queue on the lock, so calls are released in arrival order
+        async with self._lock:
+            now = time.monotonic()
+            while self._calls and now - self._calls[0] >= self.period:
+                self._calls.popleft()
+
+            if len(self._calls) >= self.max_calls:
+                await asyncio.sleep(self._calls[0] + self.period - now)
+                self._calls.popleft()
+
+            self._calls.append(time.monotonic())
+
+    async def __aenter__(self) -> "RateLimiter":
+        """Acquire a call slot for the duration of an async with block."""
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """Nothing to release; the call stays counted for the rest of the window."""
+        return None
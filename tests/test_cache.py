@@ -0,0 +1,50 @@
+"""Tests for the in-memory cache helpers."""
+
+from unittest.mock import patch
+
+from src.utils import cache
+from src.utils.cache import TTLCache, normalize_text
+
+
+def test_normalize_text():
+    """Test that case and whitespace differences are ignored."""
+    assert normalize_text("  4 Uur\tvoor  ACME \n") == "4 uur voor acme"
+
+
+def test_get_and_put():
+    """Test storing and reading values."""
+    ttl_cache = TTLCache(maxsize=2, ttl=60)
+    ttl_cache.put("a", 1)
+
+    assert ttl_cache.get("a") == 1
+    assert ttl_cache.get("missing") is None
+
+
+def test_least_recently_used_is_evicted():
+    """Test that the least recently used entry is dropped when full."""
+    ttl_cache = TTLCache(maxsize=2, ttl=60)
+    ttl_cache.put("a", 1)
+    ttl_cache.put("b", 2)
+
+    # Reading "a" makes "b" the least recently used entry
+    ttl_cache.get("a")
+    ttl_cache.put("c", 3)
+
+    assert ttl_cache.get("b") is None
+    assert ttl_cache.get("a") == 1
+    assert ttl_cache.get("c") == 3
+    assert len(ttl_cache) == 2
+
+
+def test_entries_expire():
+    """Test that entries are dropped once their TTL has passed."""
+    ttl_cache = TTLCache(maxsize=2, ttl=60)
+    with patch.object(cache.time, "monotonic", return_value=100.0):
+        ttl_cache.put("a", 1)
+
+    with patch.object(cache.time, "monotonic", return_value=159.0):
+        assert ttl_cache.get("a") == 1
+
+    with patch.object(cache.time, "monotonic", return_value=160.0):
+        assert ttl_cache.get("a") is None
+    assert len(ttl_cache) == 0
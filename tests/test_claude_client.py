@@ -2,15 +2,17 @@
 
 import pytest
 import json
+import asyncio
 import os
 from unittest.mock import patch, MagicMock, AsyncMock
-from datetime import datetime
+from datetime import datetime, timedelta
+from types import SimpleNamespace
 
 # Import patch
 from tests.patch_imports import patch_imports
 patch_imports()
 
-from src.integrations.claude.client import ClaudeClient
+from src.integrations.claude.client import ClaudeClient, get_claude_client
 
 
 class MockAnthropicResponse:
@@ -18,10 +20,7 @@ class MockAnthropicResponse:
     
     def __init__(self, content):
         """Initialize with content."""
-        self.content = [{
-            "text": content,
-            "type": "text"
-        }]
+        self.content = [SimpleNamespace(text=content, type="text")]
 
 
 @pytest.fixture
@@ -29,7 +28,7 @@ def mock_anthropic_client():
     """Create a mock Anthropic client."""
     mock_client = MagicMock()
     mock_client.messages = MagicMock()
-    mock_client.messages.create = MagicMock()
+    mock_client.messages.create = AsyncMock()
     return mock_client
 
 
@@ -37,7 +36,7 @@ def mock_anthropic_client():
 def claude_client(mock_anthropic_client):
     """Create a ClaudeClient with mocked Anthropic client."""
     with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test_api_key"}):
-        with patch("anthropic.Anthropic", return_value=mock_anthropic_client):
+        with patch("anthropic.AsyncAnthropic", return_value=mock_anthropic_client):
             client = ClaudeClient()
             return client
 
@@ -62,20 +61,36 @@ async def test_analyze_work_entry_valid(claude_client, mock_anthropic_client):
     result = await claude_client.analyze_work_entry("3.5 hours for Test Client: Test work")
     
     # Verify
-    assert result["is_work_entry"] is True
-    assert result["client"] == "Test Client"
-    assert result["hours"] == 3.5
-    assert result["billable"] is True
-    assert result["date"] == "25-03-2025"
-    assert result["description"] == "Test work"
+    assert result.is_work_entry is True
+    assert result.client == "Test Client"
+    assert result.hours == 3.5
+    assert result.billable is True
+    assert result.date == "25-03-2025"
+    assert result.description == "Test work"
+    assert result.description_preview == "Test work"
     
     # Check that the API was called with the right parameters
     mock_anthropic_client.messages.create.assert_called_once()
     call_args = mock_anthropic_client.messages.create.call_args[1]
-    assert call_args["model"] == claude_client.model
+    assert call_args["model"] == claude_client.extract_model
+    assert call_args["max_tokens"] == claude_client.ANALYSIS_MAX_TOKENS
     assert "User text: 3.5 hours for Test Client: Test work" in call_args["messages"][0]["content"]
 
 
+@pytest.mark.asyncio
+async def test_analyze_work_entry_json_with_prose(claude_client, mock_anthropic_client):
+    """Test that JSON surrounded by prose is still extracted."""
+    payload = json.dumps({"is_work_entry": True, "client": "Test Client", "hours": 1, "date": "25-03-2025"})
+    mock_anthropic_client.messages.create.return_value = MockAnthropicResponse(
+        f"Here is the extracted information:\n{payload}\nLet me know if anything is off."
+    )
+    
+    result = await claude_client.analyze_work_entry("1 uur voor Test Client")
+    
+    assert result.is_work_entry is True
+    assert result.client == "Test Client"
+
+
 @pytest.mark.asyncio
 async def test_analyze_work_entry_invalid_json(claude_client, mock_anthropic_client):
     """Test handling invalid JSON in response."""
@@ -86,7 +101,45 @@ async def test_analyze_work_entry_invalid_json(claude_client, mock_anthropic_cli
     result = await claude_client.analyze_work_entry("Hello, how are you?")
     
     # Verify
-    assert result["is_work_entry"] is False
+    assert result.is_work_entry is False
+
+
+@pytest.mark.asyncio
+async def test_analyze_work_entry_coerces_loose_values(claude_client, mock_anthropic_client):
+    """Test that hours with a unit and null booleans are accepted."""
+    mock_anthropic_client.messages.create.return_value = MockAnthropicResponse(json.dumps({
+        "is_work_entry": True,
+        "client": "Test Client",
+        "hours": "3,5 uur",
+        "billable": None,
+        "date": "25-03-2025",
+        "hourly_rate": "€85"
+    }))
+    
+    result = await claude_client.analyze_work_entry("3,5 uur voor Test Client")
+    
+    assert result.is_work_entry is True
+    assert result.hours == 3.5
+    assert result.billable is True
+    assert result.hourly_rate == 85
+    mock_anthropic_client.messages.create.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_analyze_work_entry_asks_again_on_invalid_reply(claude_client, mock_anthropic_client):
+    """Test that an invalid reply is retried once with the validation errors."""
+    mock_anthropic_client.messages.create.side_effect = [
+        MockAnthropicResponse(json.dumps({"is_work_entry": True, "client": "Test Client", "hours": "veel"})),
+        MockAnthropicResponse(json.dumps({"is_work_entry": True, "client": "Test Client", "hours": 2})),
+    ]
+    
+    result = await claude_client.analyze_work_entry("Lang gewerkt voor Test Client")
+    
+    assert result.hours == 2
+    assert mock_anthropic_client.messages.create.call_count == 2
+    retry_messages = mock_anthropic_client.messages.create.call_args.kwargs["messages"]
+    assert [message["role"] for message in retry_messages] == ["user", "assistant", "user"]
+    assert "hours" in retry_messages[-1]["content"]
 
 
 @pytest.mark.asyncio
@@ -99,7 +152,7 @@ async def test_analyze_work_entry_exception(claude_client, mock_anthropic_client
     result = await claude_client.analyze_work_entry("3.5 hours for Test Client")
     
     # Verify
-    assert result["is_work_entry"] is False
+    assert result.is_work_entry is False
 
 
 @pytest.mark.asyncio
@@ -127,7 +180,7 @@ async def test_analyze_work_entry_no_date(claude_client, mock_anthropic_client):
         result = await claude_client.analyze_work_entry("3.5 hours for Test Client")
     
     # Verify
-    assert result["date"] == "25-03-2025"  # Should default to today
+    assert result.date == "25-03-2025"  # Should default to today
 
 
 @pytest.mark.asyncio
@@ -166,7 +219,87 @@ async def test_date_format_validation(claude_client, mock_anthropic_client):
             result = await claude_client.analyze_work_entry(f"3.5 hours on {input_date}")
         
         # Verify date format was corrected
-        assert result["date"] == expected_date, f"Failed for input date: {input_date}"
+        assert result.date == expected_date, f"Failed for input date: {input_date}"
+
+
+@pytest.mark.asyncio
+async def test_analyze_work_entry_cached(claude_client, mock_anthropic_client):
+    """Test that repeated messages reuse the earlier analysis."""
+    mock_response = {
+        "is_work_entry": True,
+        "client": "Test Client",
+        "hours": 2,
+        "billable": True,
+        "date": "25-03-2025",
+        "description": "Test work"
+    }
+    mock_anthropic_client.messages.create.return_value = MockAnthropicResponse(json.dumps(mock_response))
+    
+    first = await claude_client.analyze_work_entry("2 uur voor Test Client")
+    second = await claude_client.analyze_work_entry("  2 UUR voor test client ")
+    
+    # Only one API call for messages that normalize to the same text
+    mock_anthropic_client.messages.create.assert_called_once()
+    assert second.client == first.client == "Test Client"
+    
+    # Failed analyses are not cached
+    mock_anthropic_client.messages.create.side_effect = Exception("API error")
+    assert (await claude_client.analyze_work_entry("iets anders")).is_work_entry is False
+    mock_anthropic_client.messages.create.side_effect = None
+    await claude_client.analyze_work_entry("iets anders")
+    assert mock_anthropic_client.messages.create.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_analyze_work_entry_coalesces_concurrent_requests(claude_client, mock_anthropic_client):
+    """Test that identical messages analyzed at the same time share one API call."""
+    payload = json.dumps({"is_work_entry": True, "client": "Test Client", "hours": 1, "date": "25-03-2025"})
+    
+    async def slow_create(**kwargs):
+        await asyncio.sleep(0.01)
+        return MockAnthropicResponse(payload)
+    
+    mock_anthropic_client.messages.create.side_effect = slow_create
+    
+    first, second = await asyncio.gather(
+        claude_client.analyze_work_entry("1 uur voor Test Client"),
+        claude_client.analyze_work_entry("1 uur voor test client"),
+    )
+    
+    mock_anthropic_client.messages.create.assert_called_once()
+    assert first.client == second.client == "Test Client"
+    assert first is not second
+
+
+@pytest.mark.asyncio
+async def test_analyze_work_entries_keeps_order(claude_client, mock_anthropic_client):
+    """Test that bulk analysis returns one result per text, in input order."""
+    async def create(**kwargs):
+        client = "Beta" if "Beta" in kwargs["messages"][0]["content"] else "Alpha"
+        return MockAnthropicResponse(json.dumps({"is_work_entry": True, "client": client, "hours": 1}))
+    
+    mock_anthropic_client.messages.create.side_effect = create
+    
+    results = await claude_client.analyze_work_entries(["1 uur Alpha", "1 uur Beta", "1 uur Alpha"])
+    
+    assert [r.client for r in results] == ["Alpha", "Beta", "Alpha"]
+    # The repeated text is served from the shared request or the cache
+    assert mock_anthropic_client.messages.create.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_analyze_work_entry_resolves_dutch_date_locally(claude_client, mock_anthropic_client):
+    """Test that a Dutch relative date is resolved without relying on Claude."""
+    mock_anthropic_client.messages.create.return_value = MockAnthropicResponse(
+        json.dumps({"is_work_entry": True, "client": "Acme", "hours": 2, "date": "01-01-2000"})
+    )
+    
+    result = await claude_client.analyze_work_entry("gisteren 2 uur voor Acme")
+    
+    yesterday = (datetime.now().date() - timedelta(days=1)).strftime("%d-%m-%Y")
+    assert result.date == yesterday
+    prompt = mock_anthropic_client.messages.create.call_args[1]["messages"][0]["content"]
+    assert f"The work was done on {yesterday}" in prompt
 
 
 @pytest.mark.asyncio
@@ -198,4 +331,20 @@ async def test_generate_response_exception(claude_client, mock_anthropic_client)
     result = await claude_client.generate_response("Test message")
     
     # Verify
-    assert "Sorry, I'm having trouble" in result
\ No newline at end of file
+    assert "Sorry, I'm having trouble" in result
+
+
+@pytest.mark.asyncio
+async def test_close_replaces_shared_client(mock_anthropic_client):
+    """Test that closing the shared client makes get_claude_client create a new one."""
+    mock_anthropic_client.close = AsyncMock()
+    get_claude_client.cache_clear()
+    with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test_api_key"}):
+        with patch("anthropic.AsyncAnthropic", return_value=mock_anthropic_client):
+            shared = get_claude_client()
+            await shared.close()
+            
+            mock_anthropic_client.close.assert_awaited_once()
+            assert get_claude_client() is not shared
+    get_claude_client.cache_clear()
+
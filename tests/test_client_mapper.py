@@ -6,6 +6,10 @@ import json
 from unittest.mock import patch, mock_open
 from pathlib import Path
 
+# Import patch
+from tests.patch_imports import patch_imports
+patch_imports()
+
 from src.integrations.client_mapper import ClientMapper
 
 
@@ -126,11 +130,11 @@ def test_save_mappings():
     
     with patch("builtins.open", mock_open()):
         with patch("os.makedirs"):
-            with patch("json.dump") as mock_dump:
+            with patch("src.integrations.client_mapper.dump_json") as mock_dump:
                 mapper = ClientMapper(config_file="test_config.json")
                 mapper.client_codes = sample_data
                 mapper._save_mappings()
-                mock_dump.assert_called_once_with(sample_data, mock_open()(), indent=2)
+                mock_dump.assert_called_once_with("test_config.json", sample_data)
 
 
 def test_integration_with_google_sheets():
@@ -185,4 +189,42 @@ def test_integration_with_google_sheets():
                     call_args = client.sheets.spreadsheets().values().update.call_args[1]
                     
                     # Check that the body contains our client code
-                    assert call_args["body"]["values"][0][1] == "TST"  # Client column should be TST
\ No newline at end of file
+                    assert call_args["body"]["values"][0][1] == "TST"  # Client column should be TST
+
+def test_get_all_mappings_is_read_only_view(client_mapper):
+    """Test that all mappings are returned as a live read-only view."""
+    mappings = client_mapper.get_all_mappings()
+    assert mappings == client_mapper.client_codes
+    
+    with pytest.raises(TypeError):
+        mappings["new"] = "NEW"
+    
+    version = client_mapper.version
+    with patch.object(client_mapper, "_save_mappings"):
+        client_mapper.add_mapping("New Client", "NEW")
+    
+    assert mappings["newclient"] == "NEW"
+    assert client_mapper.version == version + 1
+
+
+def test_partial_match_uses_current_mappings(client_mapper):
+    """Test that partial lookups see mappings added after earlier lookups."""
+    assert client_mapper.get_code("Stark Industries Europe") is None
+    
+    with patch.object(client_mapper, "_save_mappings"):
+        client_mapper.add_mapping("Stark Industries", "STK")
+    
+    # Stored name inside the query, and query inside the stored name
+    assert client_mapper.get_code("Stark Industries Europe") == "STK"
+    assert client_mapper.get_code("Industries") == "STK"
+    assert client_mapper.find_existing_clients("dustr") == [("starkindustries", "STK")]
+
+
+def test_partial_match_returns_first_mapping(client_mapper):
+    """Test that overlapping partial matches resolve in mapping order."""
+    client_mapper.client_codes = {"globexeast": "GLE", "globex": "GLB", "go": "GOX"}
+    
+    assert client_mapper.get_code("Globex") == "GLB"
+    assert client_mapper.get_code("Globe") == "GLE"
+    assert client_mapper.get_code("Go West") == "GOX"
+    assert [code for _, code in client_mapper.find_existing_clients("globe")] == ["GLE", "GLB"]
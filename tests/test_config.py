@@ -11,6 +11,14 @@ patch_imports()
 from src.core.config import load_config, AppConfig, BotConfig, ClaudeConfig, GoogleSheetsConfig
 
 
+@pytest.fixture(autouse=True)
+def clear_config_cache():
+    """Make every test read the environment again."""
+    load_config.cache_clear()
+    yield
+    load_config.cache_clear()
+
+
 @pytest.fixture
 def mock_env_vars():
     """Set up mock environment variables for testing."""
@@ -37,7 +45,7 @@ def test_load_config(mock_env_vars):
     
     # Check bot config
     assert config.bot.telegram_token == "test_token"
-    assert config.bot.allowed_user_ids == [123, 456, 789]
+    assert config.bot.allowed_user_ids == frozenset({123, 456, 789})
     
     # Check Claude config
     assert config.claude.api_key == "test_api_key"
@@ -61,7 +69,7 @@ def test_load_config_defaults():
             config = load_config()
             
             # Check default values
-            assert config.claude.model == "claude-3-opus-20240229"
+            assert config.claude.model == "claude-3-haiku-20240307"
             assert config.sheets.credentials_file == "credentials.json"
             assert config.sheets.token_file == "token.json"
             assert config.debug is False
@@ -83,6 +91,7 @@ def test_debug_flag_values():
     ]
     
     for value, expected in test_cases:
+        load_config.cache_clear()
         with patch.dict(os.environ, {"DEBUG": value}):
             config = load_config()
             assert config.debug is expected, f"Failed for DEBUG={value}"
@@ -92,8 +101,36 @@ def test_empty_allowed_users():
     """Test handling of empty allowed users list."""
     with patch.dict(os.environ, {"TELEGRAM_ALLOWED_USER_IDS": ""}):
         config = load_config()
-        assert config.bot.allowed_user_ids == []
+        assert config.bot.allowed_user_ids == frozenset()
         
+    load_config.cache_clear()
     with patch.dict(os.environ, {"TELEGRAM_ALLOWED_USER_IDS": "  ,  ,  "}):
         config = load_config()
-        assert config.bot.allowed_user_ids == []
\ No newline at end of file
+        assert config.bot.allowed_user_ids == frozenset()
+
+def test_webhook_mode_config():
+    """Test loading the webhook transport settings."""
+    env_vars = {
+        "TELEGRAM_MODE": "Webhook",
+        "TELEGRAM_WEBHOOK_URL": "https://bramify.example.com",
+        "TELEGRAM_WEBHOOK_PORT": "8080",
+        "TELEGRAM_WEBHOOK_SECRET": "secret"
+    }
+    with patch.dict(os.environ, env_vars):
+        config = load_config()
+        assert config.bot.mode == "webhook"
+        assert config.bot.webhook_url == "https://bramify.example.com"
+        assert config.bot.webhook_port == 8080
+        assert config.bot.webhook_secret == "secret"
+    
+    load_config.cache_clear()
+    with patch("src.core.config.load_dotenv"):
+        with patch.dict(os.environ, {}, clear=True):
+            config = load_config()
+            assert config.bot.mode == "polling"
+            assert config.bot.webhook_url is None
+
+
+def test_load_config_is_cached(mock_env_vars):
+    """Test that the configuration is only built once."""
+    assert load_config() is load_config()
@@ -1,8 +1,8 @@
 """Tests for date utilities."""
 
 import pytest
-from datetime import datetime, timedelta
-from src.utils.date_utils import parse_date_text, get_date_range_for_period
+from datetime import date, datetime, timedelta
+from src.utils.date_utils import parse_date_text, get_date_range_for_period, resolve_dutch_relative_date
 
 def test_parse_date_today():
     """Test parsing 'today' from text."""
@@ -28,6 +28,23 @@ def test_parse_date_formats():
     # Short year format
     assert parse_date_text("On 15-01-23 I worked on Project X") == "2023-01-15"
 
+def test_resolve_dutch_relative_date():
+    """Test resolving Dutch relative date expressions."""
+    today = date(2025, 3, 26)
+    assert resolve_dutch_relative_date("2 uur voor Acme vandaag", today) == today
+    assert resolve_dutch_relative_date("Gisteren 3 uur bij Acme", today) == date(2025, 3, 25)
+    assert resolve_dutch_relative_date("eergisteren 1 uur", today) == date(2025, 3, 24)
+    assert resolve_dutch_relative_date("overmorgen 1 uur", today) == date(2025, 3, 28)
+    assert resolve_dutch_relative_date("vorige week 4 uur", today) == date(2025, 3, 19)
+
+def test_resolve_dutch_relative_date_ambiguous():
+    """Test that unclear or explicit dates are left to Claude."""
+    today = date(2025, 3, 26)
+    assert resolve_dutch_relative_date("2 uur voor Acme", today) is None
+    assert resolve_dutch_relative_date("vandaag 2 uur, gisteren 3 uur", today) is None
+    assert resolve_dutch_relative_date("vandaag de uren van 24-03 invullen", today) is None
+    assert resolve_dutch_relative_date("'s morgens 2 uur", today) is None
+
 def test_get_date_range_today():
     """Test getting date range for 'today'."""
     today = datetime.now().date().strftime("%Y-%m-%d")
@@ -0,0 +1,41 @@
+"""Tests for file system utilities."""
+
+import os
+
+from src.utils.file_utils import find_latest_file, find_latest_client_secret
+
+
+def _touch(path, mtime):
+    """Create a file with a specific modification time."""
+    path.write_text("{}")
+    os.utime(path, (mtime, mtime))
+
+
+def test_find_latest_client_secret(tmp_path):
+    """Test that the newest matching client secret is returned."""
+    _touch(tmp_path / "client_secret_old.json", 1000)
+    _touch(tmp_path / "client_secret_new.json", 2000)
+    _touch(tmp_path / "other.json", 3000)
+    _touch(tmp_path / "client_secret_newest.txt", 4000)
+
+    assert find_latest_client_secret(tmp_path) == tmp_path / "client_secret_new.json"
+
+
+def test_find_latest_file_pattern(tmp_path):
+    """Test matching with a custom glob pattern."""
+    _touch(tmp_path / "project-key.json", 1000)
+    _touch(tmp_path / "nodash.json", 2000)
+    (tmp_path / "dir-name.json").mkdir()
+
+    assert find_latest_file(tmp_path, "*-*.json") == tmp_path / "project-key.json"
+
+
+def test_find_latest_file_no_match(tmp_path):
+    """Test that None is returned when nothing matches."""
+    _touch(tmp_path / "other.json", 1000)
+    assert find_latest_client_secret(tmp_path) is None
+
+
+def test_find_latest_file_missing_directory(tmp_path):
+    """Test that a missing directory is treated as empty."""
+    assert find_latest_client_secret(tmp_path / "missing") is None
@@ -0,0 +1,361 @@
+"""Tests for the Google Sheets client."""
+
+import os
+import json
+import pytest
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+
+from src.integrations.google_sheets import client as sheets_module
+from src.integrations.google_sheets.client import load_service_account_credentials
+
+
+@pytest.fixture
+def service_account_file(tmp_path):
+    """Write a minimal service account key file."""
+    path = tmp_path / "service_account.json"
+    path.write_text(json.dumps({"type": "service_account", "client_email": "bot@example.com"}))
+    sheets_module._cached_service_account_credentials.cache_clear()
+    yield path
+    sheets_module._cached_service_account_credentials.cache_clear()
+
+
+def test_service_account_credentials_are_cached(service_account_file):
+    """Test that an unchanged key file is only parsed once."""
+    scopes = ["https://www.googleapis.com/auth/spreadsheets"]
+    with patch.object(
+        sheets_module.service_account.Credentials, "from_service_account_info"
+    ) as mock_from_info:
+        mock_from_info.return_value = MagicMock()
+
+        first = load_service_account_credentials(str(service_account_file), scopes)
+        second = load_service_account_credentials(str(service_account_file), scopes)
+
+        assert first is second
+        mock_from_info.assert_called_once_with(
+            {"type": "service_account", "client_email": "bot@example.com"}, scopes=scopes
+        )
+
+
+def test_service_account_credentials_reload_on_change(service_account_file):
+    """Test that a modified key file is parsed again."""
+    scopes = ["https://www.googleapis.com/auth/spreadsheets"]
+    with patch.object(
+        sheets_module.service_account.Credentials, "from_service_account_info"
+    ) as mock_from_info:
+        mock_from_info.side_effect = lambda info, scopes: MagicMock()
+
+        load_service_account_credentials(str(service_account_file), scopes)
+
+        service_account_file.write_text(json.dumps({"type": "service_account", "client_email": "new@example.com"}))
+        stat = os.stat(service_account_file)
+        os.utime(service_account_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        load_service_account_credentials(str(service_account_file), scopes)
+
+        assert mock_from_info.call_count == 2
+
+
+def test_sheets_service_is_shared_per_credentials():
+    """Test that clients with the same credentials share one service."""
+    sheets_module.get_sheets_service.cache_clear()
+    credentials = MagicMock()
+    with patch.object(sheets_module, "build") as mock_build:
+        first = sheets_module.get_sheets_service(credentials)
+        second = sheets_module.get_sheets_service(credentials)
+
+        assert first is second
+        mock_build.assert_called_once_with("sheets", "v4", credentials=credentials)
+    sheets_module.get_sheets_service.cache_clear()
+
+
+@pytest.fixture
+def sheets_client():
+    """Create a GoogleSheetsClient without touching the network."""
+    client = object.__new__(sheets_module.GoogleSheetsClient)
+    client.sheets = MagicMock()
+    client.spreadsheet_id = "test_spreadsheet_id"
+    client.test_sheet = "Test-2024"
+    client.work_hours_sheet = "2024"
+    client.sheet_ids = {"2024": 0, "Test-2024": 1}
+    client.sheet_row_counts = {"2024": 1000, "Test-2024": 1000}
+    client._set_column_mapping({
+        'date': 0,
+        'client': 1,
+        'description': 2,
+        'hours': 3,
+        'unbillable_hours': 4,
+        'revenue': 5
+    })
+    return client
+
+
+def test_add_work_entries_uses_single_batch_update(sheets_client):
+    """Test that several entries are written with one batchUpdate request."""
+    entries = [
+        ({"date": "01-03-2024", "client": "Acme", "hours": 2, "description": "A"}, True),
+        ({"date": "01-03-2024", "client": "Globex", "hours": 3, "description": "B"}, True),
+        ({"date": "02-03-2024", "client": "Acme", "hours": 1, "description": "C"}, False),
+    ]
+    with patch.object(sheets_client, "_find_row_for_entry", return_value=(5, True)):
+        assert sheets_client.add_work_entries(entries) is True
+
+    batch_update = sheets_client.sheets.spreadsheets().values().batchUpdate
+    batch_update.assert_called_once()
+    data = batch_update.call_args.kwargs["body"]["data"]
+
+    # New rows for the same date go below each other
+    assert [d["range"] for d in data] == ["Test-2024!A5:G5", "Test-2024!A6:G6", "2024!A5:G5"]
+    assert data[1]["values"][0][1] == "Globex"
+
+    # The new rows are inserted first, so existing rows move down instead of being overwritten
+    requests = sheets_client.sheets.spreadsheets().batchUpdate.call_args.kwargs["body"]["requests"]
+    assert [r["insertDimension"]["range"] for r in requests] == [
+        {"sheetId": 1, "dimension": "ROWS", "startIndex": 4, "endIndex": 6},
+        {"sheetId": 0, "dimension": "ROWS", "startIndex": 4, "endIndex": 5},
+    ]
+
+
+def test_add_work_entries_overwrites_existing_client_row(sheets_client):
+    """Test that entries for an existing client row don't spill into the next row."""
+    entries = [
+        ({"date": "01-03-2024", "client": "Acme", "hours": 2, "description": "A"}, True),
+        ({"date": "01-03-2024", "client": "Acme", "hours": 3, "description": "B"}, True),
+    ]
+    with patch.object(sheets_client, "_find_row_for_entry", return_value=(5, False)):
+        assert sheets_client.add_work_entries(entries) is True
+    
+    data = sheets_client.sheets.spreadsheets().values().batchUpdate.call_args.kwargs["body"]["data"]
+    sheets_client.sheets.spreadsheets().batchUpdate.assert_not_called()
+    
+    # Both entries target the client's row; the later one wins, as with separate writes
+    assert [d["range"] for d in data] == ["Test-2024!A5:G5"]
+    assert data[0]["values"][0][2] == "B"
+
+
+def test_add_work_entries_same_date_in_one_batch(sheets_client):
+    """Test that entries for one date get their own rows and a repeated client reuses its row."""
+    entries = [
+        ({"date": "01-03-2024", "client": "Acme", "hours": 2, "description": "A"}, True),
+        ({"date": "01-03-2024", "client": "Globex", "hours": 3, "description": "B"}, True),
+        ({"date": "01-03-2024", "client": "Acme", "hours": 4, "description": "C"}, True),
+    ]
+    # Both new clients go at the end of the date's group, before row 5
+    with patch.object(
+        sheets_client, "_find_row_for_entry", side_effect=[(5, True), (5, True)]
+    ) as mock_find:
+        assert sheets_client.add_work_entries(entries) is True
+    
+    assert mock_find.call_count == 2
+    data = sheets_client.sheets.spreadsheets().values().batchUpdate.call_args.kwargs["body"]["data"]
+    assert [(d["range"], d["values"][0][1], d["values"][0][2]) for d in data] == [
+        ("Test-2024!A5:G5", "Acme", "C"),
+        ("Test-2024!A6:G6", "Globex", "B"),
+    ]
+    requests = sheets_client.sheets.spreadsheets().batchUpdate.call_args.kwargs["body"]["requests"]
+    assert requests == [{
+        "insertDimension": {
+            "range": {"sheetId": 1, "dimension": "ROWS", "startIndex": 4, "endIndex": 6},
+            "inheritFromBefore": True
+        }
+    }]
+
+
+def test_add_work_entries_shifts_existing_rows_below_inserts(sheets_client):
+    """Test that an existing client row below inserted rows is written at its new position."""
+    entries = [
+        ({"date": "01-03-2024", "client": "Acme", "hours": 2, "description": "A"}, True),
+        ({"date": "02-03-2024", "client": "Globex", "hours": 3, "description": "B"}, True),
+    ]
+    with patch.object(sheets_client, "_find_row_for_entry", side_effect=[(5, True), (8, False)]):
+        assert sheets_client.add_work_entries(entries) is True
+    
+    data = sheets_client.sheets.spreadsheets().values().batchUpdate.call_args.kwargs["body"]["data"]
+    assert [d["range"] for d in data] == ["Test-2024!A5:G5", "Test-2024!A9:G9"]
+
+
+def test_add_work_entry_delegates_to_batch(sheets_client):
+    """Test that a single entry goes through the batch write path."""
+    with patch.object(sheets_client, "add_work_entries", return_value=True) as mock_batch:
+        work_data = {"date": "01-03-2024", "client": "Acme", "hours": 2}
+        assert sheets_client.add_work_entry(work_data, test_mode=False) is True
+        mock_batch.assert_called_once_with([(work_data, False)])
+
+
+def test_add_work_entries_appends_without_date_row(sheets_client):
+    """Test that entries without a date row are appended with one call per sheet."""
+    entries = [
+        ({"date": "01-03-2024", "client": "Acme", "hours": 2, "description": "A"}, True),
+        ({"date": "02-03-2024", "client": "Globex", "hours": 3, "description": "B"}, True),
+    ]
+    with patch.object(sheets_client, "_find_row_for_entry", return_value=(None, False)):
+        assert sheets_client.add_work_entries(entries) is True
+    
+    values = sheets_client.sheets.spreadsheets().values()
+    values.batchUpdate.assert_not_called()
+    values.append.assert_called_once()
+    kwargs = values.append.call_args.kwargs
+    assert kwargs["range"] == "Test-2024!A:G"
+    assert [row[1] for row in kwargs["body"]["values"]] == ["Acme", "Globex"]
+
+
+def test_sheet_structure_cache_skips_metadata_requests(sheets_client, tmp_path):
+    """Test that a recent structure cache is used instead of the API."""
+    cache_file = tmp_path / "sheet_structure.json"
+    cache_file.write_text(json.dumps({
+        "spreadsheet_id": "test_spreadsheet_id",
+        "sheet_ids": {"2024": 0, "Test-2024": 7},
+        "headers": ["Klant", "Datum", "Beschrijving", "Uren", "Uren onbetaald", "Omzet"]
+    }))
+    
+    with patch.object(sheets_module, "SHEET_STRUCTURE_CACHE_FILE", str(cache_file)):
+        sheets_client._detect_sheet_structure()
+    
+    sheets_client.sheets.spreadsheets().get.assert_not_called()
+    sheets_client.sheets.spreadsheets().values().get.assert_not_called()
+    assert sheets_client.column_mapping["client"] == 0
+    assert sheets_client.column_mapping["date"] == 1
+    assert sheets_client.sheet_ids == {"2024": 0, "Test-2024": 7}
+
+
+def test_sheet_structure_cache_is_written(sheets_client, tmp_path):
+    """Test that detected sheets and headers are cached for the next startup."""
+    cache_file = tmp_path / "sheet_structure.json"
+    spreadsheets = sheets_client.sheets.spreadsheets()
+    spreadsheets.get().execute.return_value = {
+        "sheets": [
+            {
+                "properties": {"title": "2024", "sheetId": 0, "gridProperties": {"rowCount": 1000}},
+                "data": [{"rowData": [{"values": [{"formattedValue": "Datum"}, {"formattedValue": "Klant"}]}]}]
+            },
+            {"properties": {"title": "Test-2024", "sheetId": 7}, "data": [{}]}
+        ]
+    }
+    
+    with patch.object(sheets_module, "SHEET_STRUCTURE_CACHE_FILE", str(cache_file)):
+        sheets_client._detect_sheet_structure()
+    
+    # Sheet titles and headers come from the single metadata request
+    spreadsheets.values().get.assert_not_called()
+    assert spreadsheets.get.call_args.kwargs["ranges"] == ["2024!1:1"]
+    assert json.loads(cache_file.read_text()) == {
+        "spreadsheet_id": "test_spreadsheet_id",
+        "sheet_ids": {"2024": 0, "Test-2024": 7},
+        "row_counts": {"2024": 1000, "Test-2024": 0},
+        "headers": ["Datum", "Klant"]
+    }
+
+
+def test_get_work_entries_skips_rows_before_start_date(sheets_client):
+    """Test that rows of a large sheet dated before the start date are not downloaded."""
+    sheets_client.sheet_row_counts["2024"] = 5000
+    values = sheets_client.sheets.spreadsheets().values()
+    values.batchGet.return_value.execute.side_effect = [
+        {"valueRanges": [
+            {"values": [["Datum"], ["01-01-2024"], ["02-01-2024"], ["05-03-2024"], ["06-03-2024"]]}
+        ]},
+        {"valueRanges": [
+            {"values": [["Datum", "Klant"]]},
+            {"values": [["05-03-2024", "Acme"], ["06-03-2024", "Globex"]]}
+        ]}
+    ]
+    
+    entries = sheets_client.get_work_entries("2024-03-01", "2024-03-31", include_test=False)
+    
+    assert values.batchGet.call_args.kwargs["ranges"] == ["2024!A1:G1", "2024!A4:G"]
+    assert [entry["Client"] for entry in entries] == ["Globex", "Acme"]
+
+
+def test_get_work_entries_reads_small_sheet_once(sheets_client):
+    """Test that a date-filtered read of a small sheet doesn't probe the date column first."""
+    values = sheets_client.sheets.spreadsheets().values()
+    values.batchGet.return_value.execute.return_value = {"valueRanges": [
+        {"values": [["Datum", "Klant"], ["01-01-2024", "Initech"], ["05-03-2024", "Acme"]]}
+    ]}
+    
+    entries = sheets_client.get_work_entries("2024-03-01", "2024-03-31", include_test=False)
+    
+    values.batchGet.assert_called_once()
+    assert values.batchGet.call_args.kwargs["ranges"] == ["2024!A:G"]
+    assert [entry["Client"] for entry in entries] == ["Acme"]
+
+
+def test_get_work_entries_reads_all_sheets_in_one_request(sheets_client):
+    """Test that the work and test sheets are read with a single batchGet."""
+    values = sheets_client.sheets.spreadsheets().values()
+    values.batchGet.return_value.execute.return_value = {"valueRanges": [
+        {"values": [["Datum", "Klant"], ["05-03-2024", "Acme"]]},
+        {"values": [["Datum", "Klant"], ["06-03-2024", "Globex"]]}
+    ]}
+    
+    entries = sheets_client.get_work_entries()
+    
+    values.batchGet.assert_called_once()
+    assert values.batchGet.call_args.kwargs["ranges"] == ["2024!A:G", "Test-2024!A:G"]
+    assert [(entry["Client"], entry["Sheet"]) for entry in entries] == [("Globex", "Test-2024"), ("Acme", "2024")]
+
+
+def test_matching_row_ranges_trims_both_ends(sheets_client):
+    """Test that rows dated outside the filter are not requested."""
+    dates = [["Datum"], ["01-01-2024"], ["05-03-2024"], [], ["06-03-2024"], ["01-04-2024"], ["02-04-2024"]]
+    start_dt = datetime(2024, 3, 1)
+    end_dt = datetime(2024, 3, 31, 23, 59, 59)
+    
+    assert sheets_client._matching_row_ranges("2024", dates, start_dt, end_dt) == [
+        "2024!A1:G1", "2024!A3:G5", "2024!A8:G"
+    ]
+    assert sheets_client._matching_row_ranges("2024", dates, None, None) == ["2024!A:G"]
+
+
+def test_refreshed_oauth_token_is_saved(sheets_client, tmp_path):
+    """Test that a refreshed access token is written back to the token file."""
+    token_file = tmp_path / "token.json"
+    token_file.write_text("{}")
+    sheets_client.token_file = str(token_file)
+    credentials = MagicMock()
+    credentials.to_json.return_value = '{"token": "new"}'
+    
+    sheets_client._save_oauth_token(credentials)
+    
+    assert json.loads(token_file.read_text()) == {"token": "new"}
+    assert list(tmp_path.iterdir()) == [token_file]
+
+
+def test_map_headers():
+    """Test that Dutch and English headers map to their columns."""
+    sheets_module.map_headers.cache_clear()
+    mapping = sheets_module.map_headers(("Klant", "Datum", "Uren onbetaald", "Uren", "Description", "Revenue"))
+    
+    assert mapping == {
+        'date': 1,
+        'client': 0,
+        'description': 4,
+        'hours': 3,
+        'unbillable_hours': 2,
+        'revenue': 5
+    }
+    assert sheets_module.map_headers(()) == sheets_module.DEFAULT_COLUMN_MAPPING
+
+
+def test_parse_sheet_date_is_cached():
+    """Test that repeated date cells are only parsed once."""
+    parse = sheets_module.GoogleSheetsClient._parse_sheet_date
+    parse.cache_clear()
+    
+    assert parse("05-03-2024") == datetime(2024, 3, 5)
+    assert parse("05-03-2024") is parse("05-03-2024")
+    assert parse("2024-03-05") is None
+    assert parse.cache_info().misses == 2
+
+
+def test_get_work_entries_sorts_by_parsed_date(sheets_client):
+    """Test that entries are sorted by date rather than by the DD-MM-YYYY string."""
+    values = sheets_client.sheets.spreadsheets().values()
+    values.batchGet.return_value.execute.return_value = {"valueRanges": [
+        {"values": [["Datum", "Klant"], ["31-01-2024", "Acme"], ["", "Initech"], ["01-03-2024", "Globex"]]}
+    ]}
+    
+    entries = sheets_client.get_work_entries(include_test=False)
+    
+    assert [entry["Client"] for entry in entries] == ["Globex", "Acme", "Initech"]
+
@@ -0,0 +1,51 @@
+"""Tests for JSON file utilities."""
+
+import json
+import pytest
+from unittest.mock import patch
+
+from src.utils import json_utils
+from src.utils.json_utils import load_json, dump_json, loads_json, dumps_json
+
+
+def test_dump_and_load_roundtrip(tmp_path):
+    """Test writing a file and reading it back."""
+    path = tmp_path / "data.json"
+    data = {"type": "service_account", "client_email": "bot@example.com"}
+
+    dump_json(path, data)
+
+    assert load_json(path) == data
+    assert load_json(str(path)) == data
+
+
+def test_dump_json_replaces_file(tmp_path):
+    """Test that writing over an existing file leaves no temporary file behind."""
+    path = tmp_path / "data.json"
+    path.write_text('{"old": true}')
+
+    dump_json(path, {"new": True})
+
+    assert load_json(path) == {"new": True}
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_dumps_json_is_indented():
+    """Test that serialized output uses a two-space indent."""
+    payload = dumps_json({"a": 1})
+    assert isinstance(payload, bytes)
+    assert payload.decode("utf-8") == json.dumps({"a": 1}, indent=2)
+
+
+def test_stdlib_fallback(tmp_path):
+    """Test that the helpers work when orjson is not installed."""
+    path = tmp_path / "data.json"
+    with patch.object(json_utils, "orjson", None):
+        dump_json(path, {"installed": {"client_id": "abc"}})
+        assert load_json(path) == {"installed": {"client_id": "abc"}}
+
+
+def test_invalid_json_raises_decode_error():
+    """Test that invalid input raises the stdlib decode error type."""
+    with pytest.raises(json.JSONDecodeError):
+        loads_json(b"not json")
@@ -199,4 +199,19 @@ async def test_get_help_text(plugin_manager):
     
     # Check that only enabled plugins are included
     assert "*Plugin 1*: Description 1" in help_text
-    assert "*Plugin 2*: Description 2" not in help_text
\ No newline at end of file
+    assert "*Plugin 2*: Description 2" not in help_text
+
+def test_help_text_is_cached_until_plugins_change(plugin_manager):
+    """Test that help text is reused until a plugin is enabled or disabled."""
+    plugin = MockPlugin(name="Plugin 1", description="Description 1")
+    plugin_manager.plugins["test1"] = plugin
+    
+    first = plugin_manager.get_help_text()
+    assert plugin_manager.get_help_text() is first
+    
+    # Disabling the plugin invalidates the cached text
+    plugin_manager.disable_plugin("test1")
+    assert "*Plugin 1*: Description 1" not in plugin_manager.get_help_text()
+    
+    plugin_manager.enable_plugin("test1")
+    assert "*Plugin 1*: Description 1" in plugin_manager.get_help_text()
@@ -0,0 +1,35 @@
+"""Tests for the rate limiting helpers."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from src.utils import rate_limit
+from src.utils.rate_limit import RateLimiter
+
+
+def test_calls_within_limit_do_not_wait():
+    """Test that calls under the limit are not delayed."""
+    limiter = RateLimiter(max_calls=2, period=60)
+
+    async def run():
+        with patch.object(rate_limit.asyncio, "sleep", AsyncMock()) as mock_sleep:
+            await limiter.acquire()
+            await limiter.acquire()
+            mock_sleep.assert_not_called()
+
+    asyncio.run(run())
+
+
+def test_call_over_limit_waits_for_oldest_to_expire():
+    """Test that a call over the limit waits until the oldest call leaves the window."""
+    limiter = RateLimiter(max_calls=2, period=60)
+
+    async def run():
+        with patch.object(rate_limit.time, "monotonic", side_effect=[100.0, 100.0, 110.0, 110.0, 130.0, 160.0]):
+            with patch.object(rate_limit.asyncio, "sleep", AsyncMock()) as mock_sleep:
+                await limiter.acquire()
+                await limiter.acquire()
+                await limiter.acquire()
+                mock_sleep.assert_awaited_once_with(30.0)
+
+    asyncio.run(run())